@@ -25,12 +25,14 @@ def rainfall_card(
     rain_24h: Optional[float],
     rain_48h: Optional[float],
     rain_72h: Optional[float],
-    data_quality: str = "ok"
+    data_quality: str = "ok",
+    delayed: bool = False,
 ):
     """
     Compact rainfall totals from nearby stations.
 
-    Shows 24/48/72 hour accumulations.
+    Shows 24/48/72 hour accumulations, marked delayed if the live
+    snapshot has not refreshed recently.
     Informational only - no automated alerts.
     """
     quality_cls = "text-muted-foreground"
@@ -43,6 +45,10 @@ def rainfall_card(
         quality_cls = "text-yellow-600"
         quality_text = "Partial data"
 
+    if delayed and data_quality != "missing":
+        quality_cls = "text-yellow-600"
+        quality_text = f"{quality_text} (delayed)"
+
     return Card(
         CardHeader(
             H4("Recent Rainfall", cls="text-sm font-semibold text-muted-foreground"),
@@ -53,11 +53,13 @@ def trend_indicator(trend: Optional[str]):
         )
 
 
-def river_card(reading: Optional[RiverReading]):
+def river_card(reading: Optional[RiverReading], delayed: bool = False):
     """
     Compact river level display with trend indicator.
 
     Informational only - no automated alerts based on level.
+    delayed marks the reading as delayed even if the gauge itself is
+    current (the live snapshot has not refreshed recently).
     """
     if reading is None:
         return Card(
@@ -102,7 +104,7 @@ def river_card(reading: Optional[RiverReading]):
             DivCentered(
                 Small(
                     f"Thame Bridge | {time_ago}",
-                    Span(" (delayed)", cls="text-yellow-600") if reading.is_stale else None,
+                    Span(" (delayed)", cls="text-yellow-600") if reading.is_stale or delayed else None,
                     cls="text-muted-foreground"
                 ),
             ),
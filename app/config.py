@@ -8,16 +8,68 @@ SHABBINGTON_LAT = 51.7485
 SHABBINGTON_LON = -1.0030
 
 # Environment Agency API
-EA_BASE_URL = "https://environment.data.gov.uk/flood-monitoring"
+# Point EA_BASE_URL at scripts/ea_replay.py to run against recorded responses
+EA_BASE_URL = os.environ.get("EA_BASE_URL", "https://environment.data.gov.uk/flood-monitoring")
 EA_THAME_BRIDGE_STATION_ID = "1961TH"  # Thame Bridge on River Thame (verified)
 EA_CACHE_TTL = 300  # 5 minutes
+EA_CACHE_MAX_ENTRIES = 256  # least recently used responses are evicted beyond this
+EA_CACHE_MAX_STALE = 24 * 3600  # seconds an expired response may still serve as a fallback
 EA_REQUEST_TIMEOUT = 10  # seconds
 
+# EA HTTP client: one keep-alive pool shared by all requests
+EA_MAX_CONNECTIONS = 10
+EA_MAX_KEEPALIVE_CONNECTIONS = 5
+EA_KEEPALIVE_EXPIRY = 60  # seconds an idle connection stays open
+EA_MAX_RETRIES = 2  # extra attempts after a timeout, connection error or 5xx
+EA_RETRY_BACKOFF = 0.5  # seconds; doubles per attempt, with full jitter
+EA_VALIDATOR_MAX_URLS = 64  # URLs whose ETag / Last-Modified and payload are kept for 304s
+EA_REQUEST_BUDGET = 8  # seconds for all EA calls made on behalf of one request or refresh
+EA_BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures that open an endpoint's circuit
+EA_BREAKER_RESET_TIMEOUT = 30  # seconds an open circuit waits before a half-open probe
+
+# Background live conditions poller
+EA_POLL_INTERVAL = EA_CACHE_TTL - 30  # refresh a little before the cache TTL runs out
+EA_SNAPSHOT_DELAYED_AGE = 2 * EA_CACHE_TTL  # older snapshots show as delayed
+
+# River gauge history
+RIVER_BUFFER_HOURS = 24  # window fetched on first load and held in memory
+RIVER_BUFFER_MAX_READINGS = 288  # ring buffer size (3 days of 15-minute readings)
+RIVER_TREND_WINDOW_HOURS = 1  # trend is the level slope over this window
+RIVER_TREND_THRESHOLD_M_PER_HOUR = 0.08  # 2cm per 15-minute reading
+RIVER_STALE_HOURS = 1  # newest reading older than this shows as delayed
+RIVER_ENRICH_TOLERANCE_HOURS = 0.5  # nearest gauge reading to a report must be this close
+
+# River gauges watched together via one bulk latest-readings call: station ID -> name.
+# Extra (e.g. upstream) gauges come from RIVER_GAUGES="ID=Name,ID=Name".
+RIVER_GAUGES = {EA_THAME_BRIDGE_STATION_ID: "Thame Bridge"}
+RIVER_GAUGES.update(
+    entry.strip().split("=", 1)
+    for entry in os.environ.get("RIVER_GAUGES", "").split(",")
+    if "=" in entry
+)
+
 # Rainfall settings
 RAINFALL_SEARCH_DIST_KM = 15
 RAINFALL_NUM_STATIONS = 3
 RAINFALL_WINDOWS_HOURS = [24, 48, 72]
 
+# Station catalogue: every EA rainfall gauge, refreshed daily and searched locally
+STATION_CATALOGUE_TTL = 24 * 3600  # seconds
+STATION_CATALOGUE_LIMIT = 10000  # above the ~1,000 rainfall gauges EA publishes
+STATION_INDEX_CELL_DEG = 0.1  # grid cell size of the nearest-station index
+
+# Deferred environmental enrichment of reports
+ENRICH_BATCH_SIZE = 500  # reports updated per run
+ENRICH_MAX_WAIT_HOURS = 6  # enrich with what is available once readings are this late
+
+# Readings held per station; reaches back far enough to total 72h before a pending report
+RAINFALL_HISTORY_HOURS = max(RAINFALL_WINDOWS_HOURS + [72]) + ENRICH_MAX_WAIT_HOURS
+EA_RAINFALL_DEADLINE = 12  # seconds for all stations, fetched concurrently
+
+# Rendered card HTML, reused while the data and the minute are unchanged
+FRAGMENT_CACHE_MAX_ENTRIES = 64
+FRAGMENT_TIME_BUCKET_SECONDS = 60  # cards show "Xm ago", so re-render once a minute
+
 # Consensus calculation
 CONSENSUS_LOOKBACK_HOURS = 8
 CONFIDENCE_WEIGHTS = {
@@ -25,13 +77,63 @@ CONFIDENCE_WEIGHTS = {
     "SAW_IT": 0.8,
     "HEARD_IT": 0.3,
 }
+DEFAULT_CONFIDENCE_WEIGHT = 0.5  # for confidence values not listed above
+
+# Optional time decay: a report's weight halves every half-life, so old
+# reports fade out instead of dropping off at the lookback cutoff
+CONSENSUS_DECAY_ENABLED = os.environ.get("CONSENSUS_DECAY", "0") == "1"
+CONSENSUS_DECAY_HALF_LIFE_HOURS = float(os.environ.get("CONSENSUS_DECAY_HALF_LIFE_HOURS", "2"))
+
+# In-memory consensus engine: serves consensus without a DB query per read.
+# Reconciled against the SQL result periodically to pick up reports
+# written by other instances.
+CONSENSUS_ENGINE_ENABLED = os.environ.get("CONSENSUS_ENGINE", "0") == "1"
+CONSENSUS_RECONCILE_INTERVAL = 60  # seconds
 
 # Rate limiting
 RATE_LIMIT_HOUR_MAX = 2  # max reports per hour per IP (one per road)
 RATE_LIMIT_DAY_MAX = 6   # max reports per 24 hours per IP
+RATE_LIMIT_MEMORY_MAX_IPS = 10_000  # IPs tracked by the in-process limiter
+
+# Write-behind report inserts: queue reports and write them in batches
+OBSERVATION_WRITE_BEHIND = os.environ.get("OBSERVATION_WRITE_BEHIND", "0") == "1"
+WRITE_BEHIND_MAX_QUEUE = 1000  # reports beyond this are written synchronously
+WRITE_BEHIND_BATCH_SIZE = 100  # flush once this many reports are queued...
+WRITE_BEHIND_FLUSH_MS = 50  # ...or this long after the first one
+WRITE_BEHIND_ACK_TIMEOUT = 10  # seconds a submit waits for its batch to commit
 
 # Database
 DATABASE_URL = os.environ.get("DATABASE_URL", os.environ.get("POSTGRES_URL", ""))
 
+# Database connection pool
+DB_POOL_MIN_SIZE = 1  # idle connections kept open once warmed
+DB_POOL_MAX_SIZE = 10  # max open connections per process
+DB_POOL_TIMEOUT = 10  # seconds to wait for a free connection
+DB_POOL_MAX_LIFETIME = 1800  # recycle connections older than 30 minutes
+DB_POOL_MAX_IDLE = 300  # close surplus connections idle for 5 minutes
+DB_POOL_HEALTHCHECK_IDLE = 30  # ping connections idle longer than this before reuse
+
+# Serverless mode: a small warm pool per function instance (auto-enabled on Vercel)
+DB_POOL_SERVERLESS = os.environ.get(
+    "DB_POOL_SERVERLESS", "1" if os.environ.get("VERCEL") else "0"
+) == "1"
+DB_POOL_SERVERLESS_MAX_SIZE = 2
+
+# Stored EA readings (river_readings / rainfall_readings tables)
+READINGS_STORE_ENABLED = os.environ.get("READINGS_STORE", "1" if DATABASE_URL else "0") == "1"
+READINGS_STORE_RETRY_AFTER = 30  # seconds before retrying a failed write
+READINGS_HISTORY_GAP_HOURS = 1  # stored history this close to both window ends is complete
+READINGS_HISTORY_MAX_HOURS = 7 * 24  # longest window the history API serves
+# EA returns 500 readings unless told otherwise; history fetches ask for this
+# many per hour of window (15-minute readings, with room for a second measure)
+READINGS_FETCH_PER_HOUR = 8
+
+# Shared second-level EA cache: "postgres" (ea_cache table), "file" or "none"
+EA_L2_CACHE = os.environ.get("EA_L2_CACHE", "postgres" if DATABASE_URL else "none")
+EA_L2_CACHE_DIR = os.environ.get("EA_L2_CACHE_DIR", ".cache/ea")
+EA_L2_RETRY_AFTER = 60  # seconds to skip the L2 cache after it fails
+
 # Security
 IP_SALT = os.environ.get("IP_SALT", "change-this-in-production")
+# Bearer token cron jobs send to /api/enrich (Vercel sets CRON_SECRET); unset disables the endpoint
+CRON_SECRET = os.environ.get("CRON_SECRET", "")
@@ -1,34 +1,289 @@
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
+from collections import deque
 from contextlib import contextmanager
+from typing import Optional
 import logging
+import threading
+import time
 
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_POOL_MAX_LIFETIME,
+    DB_POOL_MAX_IDLE,
+    DB_POOL_HEALTHCHECK_IDLE,
+    DB_POOL_SERVERLESS,
+    DB_POOL_SERVERLESS_MAX_SIZE,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within the timeout."""
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of psycopg2 connections.
+
+    Idle connections are handed out most-recently-used first so the warm
+    ones get reused. Connections are pinged before reuse if they have sat
+    idle for a while, and recycled once they pass their max lifetime.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = DB_POOL_MIN_SIZE,
+        max_size: int = DB_POOL_MAX_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        max_lifetime: float = DB_POOL_MAX_LIFETIME,
+        max_idle: float = DB_POOL_MAX_IDLE,
+        healthcheck_idle: float = DB_POOL_HEALTHCHECK_IDLE,
+    ):
+        self._dsn = dsn
+        self._min_size = min(min_size, max_size)
+        self._max_size = max_size
+        self._timeout = timeout
+        self._max_lifetime = max_lifetime
+        self._max_idle = max_idle
+        self._healthcheck_idle = healthcheck_idle
+
+        self._idle: deque = deque()  # (conn, last_used) pairs, newest on the right
+        self._created_at: dict[int, float] = {}
+        self._size = 0  # open connections, idle plus checked out
+        self._cond = threading.Condition()
+        self._stats = {
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "reuses": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "recycled": 0,
+        }
+
+    def acquire(self):
+        """Check out a healthy connection, opening one if the pool has room."""
+        deadline = time.monotonic() + self._timeout
+
+        while True:
+            conn = None
+            last_used = 0.0
+            with self._cond:
+                self._reap_idle()
+                while True:
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self._max_size:
+                        # Reserve a slot, connect outside the lock
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"No database connection free after {self._timeout}s"
+                        )
+                    self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_usable(conn, last_used):
+                self._discard(conn)
+                continue
+            else:
+                with self._cond:
+                    self._stats["reuses"] += 1
+
+            with self._cond:
+                self._stats["checkouts"] += 1
+            return conn
+
+    def release(self, conn, discard: bool = False):
+        """Return a connection to the pool, or close it if it is no longer fit."""
+        if not discard and not conn.closed:
+            try:
+                status = conn.info.transaction_status
+                if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or conn.closed or self._expired(conn):
+            if not discard and not conn.closed:
+                with self._cond:
+                    self._stats["recycled"] += 1
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        """Close all idle connections (checked-out ones close on release)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        """Snapshot of pool size and lifetime counters."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self._max_size,
+                **self._stats,
+            }
+
+    def _connect(self):
+        conn = psycopg2.connect(self._dsn, cursor_factory=RealDictCursor)
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats["connections_opened"] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+            self._cond.notify()
+
+    def _expired(self, conn) -> bool:
+        created = self._created_at.get(id(conn))
+        return created is not None and time.monotonic() - created > self._max_lifetime
+
+    def _is_usable(self, conn, last_used: float) -> bool:
+        """Reject closed or expired connections; ping ones that sat idle."""
+        if conn.closed:
+            return False
+        if self._expired(conn):
+            with self._cond:
+                self._stats["recycled"] += 1
+            return False
+        if time.monotonic() - last_used < self._healthcheck_idle:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Pooled connection failed health check: {e}")
+            with self._cond:
+                self._stats["health_check_failures"] += 1
+            return False
+
+    def _reap_idle(self):
+        """Close surplus idle connections. Caller must hold the lock."""
+        now = time.monotonic()
+        while len(self._idle) > self._min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self._max_idle:
+                break
+            self._idle.popleft()
+            try:
+                conn.close()
+            except Exception:
+                pass
+            self._created_at.pop(id(conn), None)
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Get the process-wide connection pool, creating it on first use.
+
+    In serverless mode the pool is capped at a couple of connections and
+    keeps them all warm, since each function instance serves one request
+    at a time but is reused across invocations.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if not DATABASE_URL:
+                    raise RuntimeError("DATABASE_URL not configured")
+                if DB_POOL_SERVERLESS:
+                    _pool = ConnectionPool(
+                        DATABASE_URL,
+                        min_size=DB_POOL_SERVERLESS_MAX_SIZE,
+                        max_size=DB_POOL_SERVERLESS_MAX_SIZE,
+                    )
+                else:
+                    _pool = ConnectionPool(DATABASE_URL)
+    return _pool
+
+
+def get_pool_stats() -> Optional[dict]:
+    """Pool stats, or None if the pool has not been created yet."""
+    return _pool.stats() if _pool else None
+
+
+def close_pool():
+    """Close idle pooled connections (on app shutdown)."""
+    if _pool:
+        _pool.close()
+
+
 @contextmanager
 def get_db_connection():
     """
-    Get a database connection.
+    Get a pooled database connection.
 
-    Uses a context manager to ensure connections are closed properly.
-    For serverless, we create fresh connections per request.
+    Uses a context manager so the connection always goes back to the pool.
+    Connections that hit a connection-level error are discarded rather
+    than reused.
     """
-    conn = None
+    pool = get_pool()
     try:
-        if not DATABASE_URL:
-            raise RuntimeError("DATABASE_URL not configured")
+        conn = pool.acquire()
+    except psycopg2.Error as e:
+        logger.error(f"Database error: {e}")
+        raise
 
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+    discard = False
+    try:
         yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+        discard = True
+        logger.error(f"Database error: {e}")
+        raise
     except psycopg2.Error as e:
         logger.error(f"Database error: {e}")
         raise
     finally:
-        if conn:
-            conn.close()
+        pool.release(conn, discard=discard)
 
 
 @contextmanager
@@ -72,6 +327,44 @@ def init_db():
 
             CREATE INDEX IF NOT EXISTS idx_observations_ip_time
             ON observations (ip_hash, timestamp_utc DESC);
+
+            ALTER TABLE observations
+            ADD COLUMN IF NOT EXISTS river_level_m DECIMAL(5,3),
+            ADD COLUMN IF NOT EXISTS rainfall_24h_mm DECIMAL(6,2),
+            ADD COLUMN IF NOT EXISTS rainfall_48h_mm DECIMAL(6,2),
+            ADD COLUMN IF NOT EXISTS rainfall_72h_mm DECIMAL(6,2),
+            ADD COLUMN IF NOT EXISTS env_enriched_at TIMESTAMPTZ;
+
+            -- Reports saved with conditions by the old submit path need no enrichment
+            UPDATE observations
+            SET env_enriched_at = timestamp_utc
+            WHERE env_enriched_at IS NULL
+              AND (river_level_m IS NOT NULL OR rainfall_24h_mm IS NOT NULL);
+
+            CREATE INDEX IF NOT EXISTS idx_observations_unenriched
+            ON observations (timestamp_utc)
+            WHERE env_enriched_at IS NULL;
+
+            CREATE TABLE IF NOT EXISTS river_readings (
+                station_id VARCHAR(50) NOT NULL,
+                timestamp_utc TIMESTAMPTZ NOT NULL,
+                value DOUBLE PRECISION NOT NULL,
+                PRIMARY KEY (station_id, timestamp_utc)
+            );
+
+            CREATE TABLE IF NOT EXISTS rainfall_readings (
+                station_id VARCHAR(50) NOT NULL,
+                timestamp_utc TIMESTAMPTZ NOT NULL,
+                value DOUBLE PRECISION NOT NULL,
+                PRIMARY KEY (station_id, timestamp_utc)
+            );
+
+            CREATE UNLOGGED TABLE IF NOT EXISTS ea_cache (
+                key VARCHAR(200) PRIMARY KEY,
+                payload JSONB NOT NULL,
+                stored_at TIMESTAMPTZ NOT NULL,
+                expires_at TIMESTAMPTZ NOT NULL
+            );
         """)
         logger.info("Database schema initialized")
 
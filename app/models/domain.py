@@ -1,5 +1,5 @@
 from enum import Enum, IntEnum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
@@ -82,6 +82,17 @@ class ConsensusResult:
 
 
 @dataclass
+class RoadSnapshot:
+    """Everything the road card needs for one road, loaded in one query."""
+    road_id: RoadId
+    consensus: Optional[ConsensusResult]
+    status_counts: dict[RoadStatus, int]
+    status_change: Optional[tuple[RoadStatus, datetime]]
+    observations: list[Observation]
+    failed: bool = False  # the query failed; the card shows no reports
+
+
+@dataclass(frozen=True)
 class RiverReading:
     """A river level reading from EA API."""
     station_id: str
@@ -91,25 +102,41 @@ class RiverReading:
     timestamp: datetime
     trend: Optional[str] = None  # "rising", "falling", "steady"
     is_stale: bool = False
+    rate_of_rise: Optional[float] = None  # metres per hour
 
 
 @dataclass
 class RainfallTotal:
     """Rainfall totals from an EA station."""
     station_id: str
-    total_24h: float
-    total_48h: float
-    total_72h: float
+    total_24h: Optional[float]  # None while the buffer does not cover the window
+    total_48h: Optional[float]
+    total_72h: Optional[float]
     last_reading_time: Optional[datetime]
     unit: str = "mm"
+    totals: dict[int, Optional[float]] = field(default_factory=dict)  # hours -> mm, per RAINFALL_WINDOWS_HOURS
 
 
-@dataclass
+@dataclass(frozen=True)
+class Station:
+    """An EA monitoring station from the station catalogue."""
+    station_id: str
+    label: str
+    lat: float
+    lon: float
+
+
+@dataclass(frozen=True)
 class LiveConditions:
-    """Combined live conditions for display."""
+    """
+    Combined live conditions for display.
+
+    Published as an immutable snapshot by the live conditions poller.
+    """
     river: Optional[RiverReading]
     rainfall_24h: Optional[float]
     rainfall_48h: Optional[float]
     rainfall_72h: Optional[float]
     rain_data_quality: str  # "ok", "partial", "missing"
     generated_at_utc: datetime
+    gauges: tuple[RiverReading, ...] = ()  # every RIVER_GAUGES station, when more than one is watched
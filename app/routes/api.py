@@ -3,14 +3,13 @@ from monsterui.all import *
 
 from app.components.river_card import river_card, format_time_ago
 from app.components.rainfall_card import rainfall_card
-from app.components.road_card import road_card, status_badge
-from app.services.ea_api import get_river_level, get_aggregated_rainfall
-from app.services.road_service import (
-    get_consensus,
-    get_recent_observations,
-    get_24h_status_counts,
-    get_status_change_info,
-)
+from app.components.road_card import status_badge
+from app.services.live_conditions import get_snapshot_async, is_delayed
+from app.services.ea_api import get_reading_history, get_rainfall_stations
+from app.config import RIVER_GAUGES, READINGS_HISTORY_MAX_HOURS
+from app.services.road_service import get_recent_observations
+from app.services.road_cards import road_cards
+from app.services.fragment_cache import cached_fragment
 from app.models.domain import RoadId, CONFIDENCE_LABELS, STATUS_LABELS
 
 
@@ -18,16 +17,81 @@ def register_routes(rt):
     """Register HTMX partial update endpoints."""
 
     @rt('/api/river')
-    def get():
-        """HTMX partial: Refresh river level data."""
-        reading = get_river_level()
-        return river_card(reading)
+    async def get():
+        """HTMX partial: Refresh river level data from the live snapshot."""
+        conditions = await get_snapshot_async()
+        if conditions is None:
+            return river_card(None)
+        delayed = is_delayed()
+        return cached_fragment(
+            "river",
+            (conditions.river, delayed),
+            lambda: river_card(conditions.river, delayed=delayed),
+        )
 
     @rt('/api/rainfall')
-    def get():
-        """HTMX partial: Refresh rainfall data."""
-        rain_24h, rain_48h, rain_72h, quality = get_aggregated_rainfall()
-        return rainfall_card(rain_24h, rain_48h, rain_72h, quality)
+    async def get():
+        """HTMX partial: Refresh rainfall data from the live snapshot."""
+        conditions = await get_snapshot_async()
+        if conditions is None:
+            return rainfall_card(None, None, None, "missing")
+        rainfall = (
+            conditions.rainfall_24h,
+            conditions.rainfall_48h,
+            conditions.rainfall_72h,
+            conditions.rain_data_quality,
+        )
+        delayed = is_delayed()
+        return cached_fragment(
+            "rainfall",
+            (rainfall, delayed),
+            lambda: rainfall_card(*rainfall, delayed=delayed),
+        )
+
+    @rt('/api/river/gauges')
+    async def get():
+        """JSON: latest reading of every watched river gauge, from the live snapshot."""
+        conditions = await get_snapshot_async()
+        gauges = conditions.gauges if conditions else ()
+        return {
+            "gauges": [
+                {
+                    "station_id": reading.station_id,
+                    "station_name": reading.station_name,
+                    "value": reading.value,
+                    "unit": reading.unit,
+                    "timestamp": reading.timestamp.isoformat(),
+                    "trend": reading.trend,
+                    "rate_of_rise": reading.rate_of_rise,
+                    "is_stale": reading.is_stale,
+                }
+                for reading in gauges
+            ],
+            "delayed": is_delayed(),
+        }
+
+    @rt('/api/readings/{kind}/{station_id}')
+    def get(kind: str, station_id: str, hours: float = 24):
+        """JSON: stored reading history for a watched river gauge or a nearby rain gauge."""
+        if kind == "river":
+            known = station_id in RIVER_GAUGES
+        elif kind == "rainfall":
+            known = station_id in get_rainfall_stations()
+        else:
+            known = False
+        if not known:
+            return {"error": f"Unknown {kind} station: {station_id}"}
+
+        hours = min(max(hours, 1), READINGS_HISTORY_MAX_HOURS)
+        series = get_reading_history(kind, station_id, hours)
+        return {
+            "station_id": station_id,
+            "kind": kind,
+            "hours": hours,
+            "readings": [
+                [str(t) + "Z", float(v)] for t, v in zip(series.times, series.values)
+            ],
+        }
 
     @rt('/api/road/{road_id}')
     def get(road_id: str):
@@ -37,12 +101,7 @@ def register_routes(rt):
         except ValueError:
             return P("Invalid road", cls="text-destructive")
 
-        consensus = get_consensus(validated_road)
-        status_counts = get_24h_status_counts(validated_road)
-        status_change = get_status_change_info(validated_road)
-        observations = get_recent_observations(validated_road, limit=5)
-
-        return road_card(validated_road, consensus, status_counts, status_change, observations)
+        return road_cards([validated_road])[0]
 
     @rt('/api/road/{road_id}/history')
     def get(road_id: str):
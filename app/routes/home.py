@@ -2,13 +2,7 @@ from fasthtml.common import *
 from monsterui.all import *
 
 from app.components.layout import page_layout, page_header
-from app.components.road_card import road_card
-from app.services.road_service import (
-    get_all_consensus,
-    get_24h_status_counts,
-    get_status_change_info,
-    get_recent_observations,
-)
+from app.services.road_cards import road_cards
 from app.models.domain import RoadId
 
 
@@ -18,26 +12,9 @@ def register_routes(rt):
     @rt('/')
     def get():
         """Main dashboard page - road data loads immediately, env data lazy loads."""
-        # Get current road consensus statuses (fast - just DB queries)
-        road_statuses = get_all_consensus()
-
-        # Get 24h stats for each road
-        road_stats = {
-            road_id: get_24h_status_counts(road_id)
-            for road_id in RoadId
-        }
-
-        # Get status change info for each road
-        status_changes = {
-            road_id: get_status_change_info(road_id)
-            for road_id in RoadId
-        }
-
-        # Get recent observations for each road
-        road_history = {
-            road_id: get_recent_observations(road_id, limit=5)
-            for road_id in RoadId
-        }
+        # Consensus, 24h stats, status changes and history for every road
+        # (fast - one small version query, plus one round trip if any card has to be rendered)
+        cards = road_cards(list(RoadId))
 
         return page_layout(
             "Shabb Flood - Shabbington",
@@ -53,20 +30,7 @@ def register_routes(rt):
                         ),
                         P("Community-reported passability - tap to report", cls="text-xs text-muted-foreground mb-3"),
                         Div(
-                            road_card(
-                                RoadId.ICKFORD_ENTRANCE,
-                                road_statuses[RoadId.ICKFORD_ENTRANCE],
-                                road_stats[RoadId.ICKFORD_ENTRANCE],
-                                status_changes[RoadId.ICKFORD_ENTRANCE],
-                                road_history[RoadId.ICKFORD_ENTRANCE],
-                            ),
-                            road_card(
-                                RoadId.FISHERMAN_THAME_ENTRANCE,
-                                road_statuses[RoadId.FISHERMAN_THAME_ENTRANCE],
-                                road_stats[RoadId.FISHERMAN_THAME_ENTRANCE],
-                                status_changes[RoadId.FISHERMAN_THAME_ENTRANCE],
-                                road_history[RoadId.FISHERMAN_THAME_ENTRANCE],
-                            ),
+                            *cards,
                             cls="space-y-3"
                         ),
                         cls="mb-6"
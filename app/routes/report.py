@@ -2,11 +2,10 @@ from fasthtml.common import *
 
 from app.components.report_form import report_form, submission_result
 from app.services.road_service import (
-    check_rate_limit,
-    add_observation,
+    check_local_rate_limit,
+    submit_observation,
     hash_ip,
 )
-from app.services.ea_api import get_live_conditions
 from app.models.domain import RoadId, RoadStatus, Confidence
 
 
@@ -55,9 +54,9 @@ def register_routes(rt):
 
         ip_hash = hash_ip(client_ip)
 
-        # Rate limiting check
-        is_limited, remaining = check_rate_limit(ip_hash)
-        if is_limited:
+        # Fast in-process rate limit check; rejects bursts before any DB or EA work
+        remaining = check_local_rate_limit(ip_hash)
+        if remaining:
             return submission_result(
                 success=False,
                 message=f"Too many reports. Try again in {remaining} minutes.",
@@ -87,24 +86,14 @@ def register_routes(rt):
         # Truncate and sanitize comment
         clean_comment = comment[:280].strip() if comment else None
 
-        # Get current environmental conditions for data curation
-        conditions = get_live_conditions()
-        river_level = conditions.river.value if conditions.river else None
-        rainfall_24h = conditions.rainfall_24h
-        rainfall_48h = conditions.rainfall_48h
-        rainfall_72h = conditions.rainfall_72h
-
-        # Save observation with environmental context
-        observation_id = add_observation(
+        # Rate limit check and save in one round trip. River and rainfall
+        # at the report time are filled in later by the enrichment job.
+        observation_id, remaining = submit_observation(
             road_id=validated_road,
             status=validated_status,
             confidence=validated_confidence,
             ip_hash=ip_hash,
             comment=clean_comment,
-            river_level_m=river_level,
-            rainfall_24h_mm=rainfall_24h,
-            rainfall_48h_mm=rainfall_48h,
-            rainfall_72h_mm=rainfall_72h,
         )
 
         if observation_id:
@@ -113,6 +102,12 @@ def register_routes(rt):
                 message="Your report has been recorded. Thank you for helping the community!",
                 road_id=road_id
             )
+        elif remaining:
+            return submission_result(
+                success=False,
+                message=f"Too many reports. Try again in {remaining} minutes.",
+                road_id=road_id
+            )
         else:
             return submission_result(
                 success=False,
@@ -0,0 +1,262 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, unquote
+import logging
+
+import numpy as np
+from psycopg2.extras import Json, execute_values
+
+from app.config import (
+    EA_L2_CACHE,
+    EA_L2_CACHE_DIR,
+    EA_L2_RETRY_AFTER,
+    EA_CACHE_MAX_STALE,
+)
+from app.database import get_db_cursor
+from app.models.domain import RiverReading, RainfallTotal
+from app.services.timeseries import ReadingSeries
+
+logger = logging.getLogger(__name__)
+
+# An L2 entry: (value, stored_at, expires_at), both times as Unix epoch
+# seconds so that every instance agrees on them
+L2Entry = tuple[object, float, float]
+
+
+def encode_value(value) -> object:
+    """Cached EA value to a JSON-safe payload."""
+    if isinstance(value, ReadingSeries):
+        return {
+            "type": "ReadingSeries",
+            "times": value.times.astype(np.int64).tolist(),
+            "values": value.values.tolist(),
+        }
+    if isinstance(value, (RiverReading, RainfallTotal)):
+        data = asdict(value)
+        for name, field_value in data.items():
+            if isinstance(field_value, datetime):
+                data[name] = field_value.isoformat()
+        return {"type": type(value).__name__, "data": data}
+    if isinstance(value, dict) and value and all(isinstance(v, RiverReading) for v in value.values()):
+        return {"type": "RiverReadings", "data": {key: encode_value(v) for key, v in value.items()}}
+    return {"type": "json", "data": value}
+
+
+def decode_value(payload: dict):
+    """Inverse of encode_value."""
+    kind = payload["type"]
+    if kind == "ReadingSeries":
+        return ReadingSeries(
+            np.array(payload["times"], dtype=np.int64).astype("datetime64[s]"),
+            np.array(payload["values"], dtype=np.float64),
+        )
+    if kind == "RiverReading":
+        data = payload["data"]
+        return RiverReading(**{**data, "timestamp": datetime.fromisoformat(data["timestamp"])})
+    if kind == "RainfallTotal":
+        data = payload["data"]
+        last = data["last_reading_time"]
+        return RainfallTotal(**{
+            **data,
+            "last_reading_time": datetime.fromisoformat(last) if last else None,
+            # JSON object keys are strings
+            "totals": {int(hours): total for hours, total in data["totals"].items()},
+        })
+    if kind == "RiverReadings":
+        return {key: decode_value(v) for key, v in payload["data"].items()}
+    return payload["data"]
+
+
+class CacheBackend:
+    """
+    Second-level store behind SimpleCache, shared between processes.
+
+    Backends never raise: a failure is logged, treated as a miss, and the
+    backend is skipped for EA_L2_RETRY_AFTER seconds.
+    """
+
+    name = "none"
+
+    def __init__(self):
+        self._down_until = 0.0
+        self._stats = {"warmed": 0, "hits": 0, "misses": 0, "writes": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[L2Entry]:
+        if not self._available():
+            return None
+        try:
+            entry = self._get(key)
+        except Exception as e:
+            self._failed("read", e)
+            return None
+        self._count("hits" if entry else "misses")
+        return entry
+
+    def get_all(self) -> dict[str, L2Entry]:
+        """Every entry young enough to serve as a stale fallback."""
+        if not self._available():
+            return {}
+        try:
+            entries = self._get_all(time.time() - EA_CACHE_MAX_STALE)
+        except Exception as e:
+            self._failed("read", e)
+            return {}
+        self._count("warmed", len(entries))
+        return entries
+
+    def set_many(self, entries: dict[str, L2Entry]):
+        if not entries or not self._available():
+            return
+        try:
+            self._set_many(entries)
+            self._count("writes", len(entries))
+        except Exception as e:
+            self._failed("write", e)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {"backend": self.name, **self._stats}
+
+    def _get(self, key: str) -> Optional[L2Entry]:
+        return None
+
+    def _get_all(self, oldest: float) -> dict[str, L2Entry]:
+        return {}
+
+    def _set_many(self, entries: dict[str, L2Entry]):
+        pass
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, action: str, error: Exception):
+        self._count("errors")
+        self._down_until = time.monotonic() + EA_L2_RETRY_AFTER
+        logger.warning(f"L2 cache ({self.name}) {action} failed, skipping for {EA_L2_RETRY_AFTER}s: {error}")
+
+    def _count(self, counter: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[counter] += n
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    ea_cache table in the app database.
+
+    The table is UNLOGGED: writes skip the WAL and the contents may be lost
+    on a crash, which is fine for a cache.
+    """
+
+    name = "postgres"
+
+    def _get(self, key: str) -> Optional[L2Entry]:
+        with get_db_cursor() as cur:
+            cur.execute("""
+                SELECT payload,
+                       EXTRACT(EPOCH FROM stored_at) AS stored_at,
+                       EXTRACT(EPOCH FROM expires_at) AS expires_at
+                FROM ea_cache
+                WHERE key = %s
+            """, (key,))
+            row = cur.fetchone()
+        if not row:
+            return None
+        return decode_value(row["payload"]), float(row["stored_at"]), float(row["expires_at"])
+
+    def _get_all(self, oldest: float) -> dict[str, L2Entry]:
+        with get_db_cursor() as cur:
+            cur.execute("""
+                SELECT key, payload,
+                       EXTRACT(EPOCH FROM stored_at) AS stored_at,
+                       EXTRACT(EPOCH FROM expires_at) AS expires_at
+                FROM ea_cache
+                WHERE stored_at > to_timestamp(%s)
+            """, (oldest,))
+            rows = cur.fetchall()
+        return {
+            row["key"]: (decode_value(row["payload"]), float(row["stored_at"]), float(row["expires_at"]))
+            for row in rows
+        }
+
+    def _set_many(self, entries: dict[str, L2Entry]):
+        rows = [
+            (key, Json(encode_value(value)), stored_at, expires_at)
+            for key, (value, stored_at, expires_at) in entries.items()
+        ]
+        with get_db_cursor() as cur:
+            # Never overwrite a newer entry written by another instance
+            execute_values(cur, """
+                INSERT INTO ea_cache (key, payload, stored_at, expires_at)
+                VALUES %s
+                ON CONFLICT (key) DO UPDATE
+                SET payload = EXCLUDED.payload,
+                    stored_at = EXCLUDED.stored_at,
+                    expires_at = EXCLUDED.expires_at
+                WHERE ea_cache.stored_at <= EXCLUDED.stored_at
+            """, rows, template="(%s, %s, to_timestamp(%s), to_timestamp(%s))")
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    One JSON file per key in a local directory, for single-box deployments
+    where the cache should survive restarts without a database.
+    """
+
+    name = "file"
+
+    def __init__(self, directory: str = EA_L2_CACHE_DIR):
+        super().__init__()
+        self._dir = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{quote(key, safe='')}.json"
+
+    def _read(self, path: Path) -> L2Entry:
+        record = json.loads(path.read_text())
+        return decode_value(record["payload"]), record["stored_at"], record["expires_at"]
+
+    def _get(self, key: str) -> Optional[L2Entry]:
+        path = self._path(key)
+        return self._read(path) if path.exists() else None
+
+    def _get_all(self, oldest: float) -> dict[str, L2Entry]:
+        if not self._dir.is_dir():
+            return {}
+        entries = {}
+        for path in self._dir.glob("*.json"):
+            entry = self._read(path)
+            if entry[1] > oldest:
+                entries[unquote(path.stem)] = entry
+            else:
+                path.unlink(missing_ok=True)
+        return entries
+
+    def _set_many(self, entries: dict[str, L2Entry]):
+        self._dir.mkdir(parents=True, exist_ok=True)
+        for key, (value, stored_at, expires_at) in entries.items():
+            path = self._path(key)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({
+                "payload": encode_value(value),
+                "stored_at": stored_at,
+                "expires_at": expires_at,
+            }))
+            os.replace(tmp, path)  # atomic, so readers never see half a file
+
+
+def make_backend(kind: str = EA_L2_CACHE) -> Optional[CacheBackend]:
+    """Backend named by EA_L2_CACHE ("postgres", "file" or "none")."""
+    if kind == "postgres":
+        return PostgresCacheBackend()
+    if kind == "file":
+        return FileCacheBackend()
+    if kind != "none":
+        logger.warning(f"Unknown EA_L2_CACHE {kind!r}, running without an L2 cache")
+    return None
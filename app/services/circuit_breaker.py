@@ -0,0 +1,93 @@
+import threading
+import time
+import logging
+
+from app.config import EA_BREAKER_FAILURE_THRESHOLD, EA_BREAKER_RESET_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream endpoint.
+
+    Closed: calls go through; failure_threshold consecutive failures open
+    the circuit. Open: calls are refused immediately until reset_timeout
+    has passed. Half-open: a single probe call is let through; its success
+    closes the circuit, its failure opens it again for another timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = EA_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = EA_BREAKER_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = None  # set while a half-open probe is out
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go out now. A True in half-open state is the probe.
+
+        A probe that never reports back (e.g. its task was cancelled) is
+        given up on after reset_timeout and another one let through.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == OPEN and now - self._opened_at >= self._reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_started = None
+
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and (
+                self._probe_started is None or now - self._probe_started >= self._reset_timeout
+            ):
+                self._probe_started = now
+                return True
+
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self._failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(f"Circuit {self.name} opened after {self._failures} failures")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "rejected": self._rejected,
+            }
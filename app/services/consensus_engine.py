@@ -0,0 +1,184 @@
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+import logging
+
+from app.config import (
+    CONSENSUS_LOOKBACK_HOURS,
+    CONSENSUS_RECONCILE_INTERVAL,
+    CONSENSUS_DECAY_ENABLED,
+    CONSENSUS_DECAY_HALF_LIFE_HOURS,
+    CONFIDENCE_WEIGHTS,
+    DEFAULT_CONFIDENCE_WEIGHT,
+)
+from app.models.domain import RoadId, RoadStatus, ConsensusResult
+
+logger = logging.getLogger(__name__)
+
+# Rebase decayed weights once the epoch is this many half-lives old,
+# keeping the 2 ** (age / half-life) scale factors well inside float range
+REBASE_HALF_LIVES = 32
+
+
+@dataclass
+class _RoadVotes:
+    """Running weighted vote for one road over the lookback window."""
+    weights: dict[int, float] = field(default_factory=dict)
+    counts: dict[int, int] = field(default_factory=dict)
+    latest: dict[int, datetime] = field(default_factory=dict)
+
+
+class ConsensusEngine:
+    """
+    Incremental in-memory consensus with sliding-window expiry.
+
+    Each road keeps per-status weight sums, report counts and the newest
+    report time. New reports are added as they are written; a min-heap on
+    timestamp_utc removes them again once they fall out of the lookback
+    window. Reads cost O(number of statuses) and no DB query.
+
+    With a half-life, each report's weight decays by 0.5 ^ (age / half-life)
+    as in the SQL vote. Sums are stored scaled by 2 ^ ((t - epoch) / half-life),
+    which differs from the decayed weight by a factor common to every
+    report, so adding and expiring stay O(1). Reads scale back to now.
+
+    The engine starts empty and unloaded. The caller loads it from the DB
+    once (load), then periodically compares it against the SQL consensus
+    (reconcile_due / matches) and reloads if reports written elsewhere,
+    such as another serverless instance, have made it drift.
+    """
+
+    def __init__(
+        self,
+        lookback_hours: float = CONSENSUS_LOOKBACK_HOURS,
+        reconcile_interval: float = CONSENSUS_RECONCILE_INTERVAL,
+        half_life_hours: Optional[float] = (
+            CONSENSUS_DECAY_HALF_LIFE_HOURS if CONSENSUS_DECAY_ENABLED else None
+        ),
+    ):
+        self._lookback = timedelta(hours=lookback_hours)
+        self._half_life = half_life_hours * 3600 if half_life_hours else None
+        self._epoch = datetime.now(timezone.utc)
+        self._reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._roads: dict[str, _RoadVotes] = {}
+        self._heap: list = []  # (timestamp_utc, seq, road_id, status, weight)
+        self._seq = itertools.count()
+        self._loaded = False
+        self._last_reconcile = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, rows: Iterable[dict]):
+        """Replace all state with rows of road_id, status, confidence, timestamp_utc."""
+        with self._lock:
+            self._roads = {}
+            self._heap = []
+            self._epoch = datetime.now(timezone.utc) - self._lookback
+            for row in rows:
+                self._add(row["road_id"], row["status"], row["confidence"], row["timestamp_utc"])
+            self._expire(datetime.now(timezone.utc))
+            self._loaded = True
+            self._last_reconcile = time.monotonic()
+
+    def add_observation(
+        self,
+        road_id: RoadId,
+        status: RoadStatus,
+        confidence: str,
+        timestamp_utc: datetime,
+    ):
+        """Count a newly written report. Ignored until the engine is loaded."""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._expire(datetime.now(timezone.utc))
+            self._add(road_id.value, status.value, confidence, timestamp_utc)
+
+    def get(self, road_id: RoadId) -> Optional[ConsensusResult]:
+        """Current consensus for a road, or None if it has no recent reports."""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            self._expire(now)
+            votes = self._roads.get(road_id.value)
+            if not votes or not votes.counts:
+                return None
+
+            # Same rule as the SQL vote: rounded weight, ties to the newest status
+            to_now = 1.0 / self._scale(now)
+            status = max(
+                votes.counts.keys(),
+                key=lambda s: (round(votes.weights[s] * to_now, 6), votes.latest[s]),
+            )
+
+            return ConsensusResult(
+                road_id=road_id,
+                status=RoadStatus(status),
+                report_count=sum(votes.counts.values()),
+                last_report_time=max(votes.latest.values()),
+            )
+
+    def reconcile_due(self) -> bool:
+        """Whether it is time for another drift check against the DB."""
+        return time.monotonic() - self._last_reconcile >= self._reconcile_interval
+
+    def matches(self, road_id: RoadId, expected: Optional[ConsensusResult]) -> bool:
+        """Compare against a freshly computed SQL consensus and record the check."""
+        self._last_reconcile = time.monotonic()
+        actual = self.get(road_id)
+        if actual is None or expected is None:
+            return actual is None and expected is None
+        return (
+            actual.status == expected.status
+            and actual.report_count == expected.report_count
+            and actual.last_report_time == expected.last_report_time
+        )
+
+    def _scale(self, timestamp_utc: datetime) -> float:
+        """Decay scale factor relative to the epoch (1.0 without decay)."""
+        if self._half_life is None:
+            return 1.0
+        return 2.0 ** ((timestamp_utc - self._epoch).total_seconds() / self._half_life)
+
+    def _rebase(self, now: datetime):
+        """Move the epoch forward, rescaling stored sums to match."""
+        new_epoch = now - self._lookback
+        factor = 1.0 / self._scale(new_epoch)
+        for votes in self._roads.values():
+            for status in votes.weights:
+                votes.weights[status] *= factor
+        self._epoch = new_epoch
+
+    def _add(self, road_id: str, status: int, confidence: str, timestamp_utc: datetime):
+        weight = CONFIDENCE_WEIGHTS.get(confidence, DEFAULT_CONFIDENCE_WEIGHT)
+        votes = self._roads.setdefault(road_id, _RoadVotes())
+        scaled = weight * self._scale(timestamp_utc)
+        votes.weights[status] = votes.weights.get(status, 0.0) + scaled
+        votes.counts[status] = votes.counts.get(status, 0) + 1
+        if status not in votes.latest or timestamp_utc > votes.latest[status]:
+            votes.latest[status] = timestamp_utc
+        heapq.heappush(self._heap, (timestamp_utc, next(self._seq), road_id, status, weight))
+
+    def _expire(self, now: datetime):
+        """Pop every report older than the lookback window off the heap."""
+        if self._half_life and (now - self._epoch).total_seconds() > REBASE_HALF_LIVES * self._half_life:
+            self._rebase(now)
+
+        cutoff = now - self._lookback
+        while self._heap and self._heap[0][0] <= cutoff:
+            timestamp_utc, _, road_id, status, weight = heapq.heappop(self._heap)
+            votes = self._roads[road_id]
+            votes.counts[status] -= 1
+            if votes.counts[status] == 0:
+                # Last report for this status gone: drop it (and any float residue)
+                del votes.counts[status]
+                del votes.weights[status]
+                del votes.latest[status]
+            else:
+                votes.weights[status] -= weight * self._scale(timestamp_utc)
@@ -1,54 +1,315 @@
+import asyncio
 import httpx
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from urllib.parse import urlsplit
 import logging
+import math
+import random
+import threading
 import time
 
 from app.config import (
     EA_BASE_URL,
     EA_THAME_BRIDGE_STATION_ID,
     EA_CACHE_TTL,
+    EA_CACHE_MAX_ENTRIES,
+    EA_CACHE_MAX_STALE,
     EA_REQUEST_TIMEOUT,
+    EA_MAX_CONNECTIONS,
+    EA_MAX_KEEPALIVE_CONNECTIONS,
+    EA_KEEPALIVE_EXPIRY,
+    EA_MAX_RETRIES,
+    EA_RETRY_BACKOFF,
+    EA_VALIDATOR_MAX_URLS,
+    EA_REQUEST_BUDGET,
+    READINGS_STORE_ENABLED,
+    READINGS_HISTORY_GAP_HOURS,
+    READINGS_FETCH_PER_HOUR,
+    EA_RAINFALL_DEADLINE,
     SHABBINGTON_LAT,
     SHABBINGTON_LON,
     RAINFALL_SEARCH_DIST_KM,
     RAINFALL_NUM_STATIONS,
+    RAINFALL_WINDOWS_HOURS,
+    RIVER_ENRICH_TOLERANCE_HOURS,
+    RIVER_GAUGES,
+    STATION_CATALOGUE_TTL,
+    STATION_CATALOGUE_LIMIT,
+)
+from app.models.domain import RiverReading, RainfallTotal, LiveConditions, Station
+from app.services.timeseries import RiverBuffer, RainfallBuffer, ReadingSeries, ReadingSeriesBuilder
+from app.services.json_stream import ItemsStreamParser
+from app.services.cache_backends import CacheBackend, make_backend
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.station_index import StationIndex
+from app.services.readings_store import (
+    record_readings,
+    load_readings,
+    store_series,
+    get_recorder_stats,
 )
-from app.models.domain import RiverReading, RainfallTotal, LiveConditions
 
 logger = logging.getLogger(__name__)
 
 
+class _Flight:
+    """One in-progress synchronous load that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[Exception] = None
+
+
 class SimpleCache:
-    """Simple in-memory TTL cache for EA API responses."""
+    """
+    Bounded, thread-safe in-memory TTL cache for EA API responses.
+
+    Entries carry their own TTL and are evicted least recently used
+    beyond max_entries. Expired entries stay available to get_stale (for
+    fallback) until they are max_stale seconds old.
+
+    get_or_load and get_or_load_async are single-flight: while one caller
+    loads a missing key, other callers wait for its result instead of
+    calling EA themselves.
 
-    def __init__(self, ttl: int = EA_CACHE_TTL):
-        self._cache: dict = {}
-        self._timestamps: dict = {}
+    With a backend (L2), the first load pulls every shared entry into
+    memory in one read, a missing key is looked up there before calling
+    EA, and new values are written back by a background thread so
+    requests never wait on the write.
+    """
+
+    def __init__(
+        self,
+        ttl: int = EA_CACHE_TTL,
+        max_entries: int = EA_CACHE_MAX_ENTRIES,
+        max_stale: int = EA_CACHE_MAX_STALE,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self._entries: OrderedDict[str, tuple] = OrderedDict()  # key -> (value, stored_at, ttl)
         self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_stale = max_stale
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._async_flights: dict[str, asyncio.Task] = {}
+        self._backend = backend
+        self._warmed = False
+        self._pending: dict[str, tuple] = {}  # key -> L2 entry awaiting write
+        self._writer: Optional[threading.Thread] = None
+        self._writer_wake = threading.Event()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale_serves": 0,
+            "coalesced_waits": 0,
+            "evictions": 0,
+        }
 
     def get(self, key: str):
         """Get value from cache if not expired."""
-        if key in self._cache:
-            if time.monotonic() - self._timestamps[key] < self._ttl:
-                return self._cache[key]
+        with self._lock:
+            return self._get_fresh(key)
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        """Set value in cache, with the default TTL unless one is given."""
+        ttl = self._ttl if ttl is None else ttl
+        with self._lock:
+            self._store(key, value, time.monotonic(), ttl)
+            if self._backend is not None:
+                now = time.time()
+                self._pending[key] = (value, now, now + ttl)
+                self._start_writer()
+        self._writer_wake.set()
+
+    def peek(self, key: str):
+        """Value for key whether or not expired, without touching the counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry else None
+
+    def get_stale(self, key: str):
+        """Get value even if expired (for fallback), unless older than max_stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at, _ = entry
+            if time.monotonic() - stored_at >= self._max_stale:
+                del self._entries[key]
+                return None
+            self._stats["stale_serves"] += 1
+            return value
+
+    def get_or_load(self, key: str, loader, ttl: Optional[float] = None, refresh: bool = False):
+        """
+        Cached value, or the result of loader() stored under key.
+
+        Concurrent callers for the same missing key share one loader call;
+        its exception, if any, is raised in every caller. Falsy results are
+        returned but not cached. refresh=True skips the cached value.
+        """
+        with self._lock:
+            if not refresh:
+                value = self._get_fresh(key)
+                if value is not None:
+                    return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
             else:
-                del self._cache[key]
-                del self._timestamps[key]
+                self._stats["coalesced_waits"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._load_l2(key, refresh)
+            if flight.value is None:
+                flight.value = loader()
+                if flight.value:
+                    self.set(key, flight.value, ttl)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def get_or_load_async(self, key: str, loader, ttl: Optional[float] = None, refresh: bool = False):
+        """Async get_or_load; loader is a coroutine function."""
+        with self._lock:
+            if not refresh:
+                value = self._get_fresh(key)
+                if value is not None:
+                    return value
+            task = self._async_flights.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._load_async(key, loader, ttl, refresh))
+                task.add_done_callback(_retrieve_exception)
+                self._async_flights[key] = task
+            else:
+                self._stats["coalesced_waits"] += 1
+
+        # Shielded so a caller cancelled by its deadline does not cancel the load for the rest
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {**self._stats, "entries": len(self._entries), "max_entries": self._max_entries}
+        if self._backend is not None:
+            stats["l2"] = {**self._backend.stats(), "pending_writes": len(self._pending)}
+        return stats
+
+    def flush(self):
+        """Write any pending entries to the backend now (e.g. on shutdown)."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if batch:
+            self._backend.set_many(batch)
+
+    async def _load_async(self, key: str, loader, ttl: Optional[float], refresh: bool):
+        try:
+            value = None
+            if self._backend is not None:
+                value = await asyncio.to_thread(self._load_l2, key, refresh)
+            if value is None:
+                value = await loader()
+                if value:
+                    self.set(key, value, ttl)
+            return value
+        finally:
+            with self._lock:
+                self._async_flights.pop(key, None)
+
+    def _load_l2(self, key: str, refresh: bool):
+        """
+        Fresh value for key from the backend, or None.
+
+        The first call pulls every backend entry into memory; later calls
+        look up the single key. refresh=True only does the first-call warm.
+        """
+        if self._backend is None:
+            return None
+
+        with self._lock:
+            warm, self._warmed = not self._warmed, True
+        if warm:
+            entries = self._backend.get_all()
+            logger.info(f"EA cache warmed with {len(entries)} entries from {self._backend.name}")
+        elif not refresh:
+            entry = self._backend.get(key)
+            entries = {key: entry} if entry else {}
+        else:
+            entries = {}
+
+        now, mono = time.time(), time.monotonic()
+        with self._lock:
+            for entry_key, (value, stored_at, expires_at) in entries.items():
+                current = self._entries.get(entry_key)
+                age = now - stored_at
+                # Keep ours if it is newer than the shared copy
+                if current is None or current[1] < mono - age:
+                    self._store(entry_key, value, mono - age, expires_at - stored_at)
+            if refresh:
+                return None
+            entry = self._entries.get(key)
+            if entry is not None and mono - entry[1] < entry[2]:
+                return entry[0]
+        return None
+
+    def _store(self, key: str, value, stored_at: float, ttl: float):
+        """Insert into the LRU, evicting beyond the bound. Caller holds the lock."""
+        self._entries[key] = (value, stored_at, ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _start_writer(self):
+        """Start the background L2 writer if it is not running. Caller holds the lock."""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="ea-cache-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            self._writer_wake.wait()
+            self._writer_wake.clear()
+            self.flush()
+
+    def _get_fresh(self, key: str):
+        """Unexpired value (marked recently used) or None. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at, ttl = entry
+            if time.monotonic() - stored_at < ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return value
+        self._stats["misses"] += 1
         return None
 
-    def set(self, key: str, value):
-        """Set value in cache."""
-        self._cache[key] = value
-        self._timestamps[key] = time.monotonic()
 
-    def get_stale(self, key: str):
-        """Get value even if expired (for fallback)."""
-        return self._cache.get(key)
+def _retrieve_exception(task: asyncio.Task):
+    """Mark a load's exception as seen, in case every waiter was cancelled."""
+    if not task.cancelled():
+        task.exception()
 
 
-# Global cache instance
-_cache = SimpleCache()
+# Global cache instance, backed by the shared L2 store named in EA_L2_CACHE
+_cache = SimpleCache(backend=make_backend())
 
 
 class EAApiError(Exception):
@@ -56,204 +317,852 @@ class EAApiError(Exception):
     pass
 
 
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Shared keep-alive clients, created on first use and closed on app shutdown.
+# The async client belongs to the server's event loop.
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_client_lock = threading.Lock()
+
+# Per-host request and new-connection counters (the difference is reuse),
+# plus body bytes received and saved by 304 Not Modified responses
+_host_stats: dict[str, dict[str, int]] = defaultdict(
+    lambda: {
+        "requests": 0,
+        "new_connections": 0,
+        "retries": 0,
+        "responses": 0,
+        "not_modified": 0,
+        "bytes_received": 0,
+        "bytes_saved": 0,
+        "short_circuited": 0,
+        "deadline_exceeded": 0,
+    }
+)
+_stats_lock = threading.Lock()
+
+# Validators and parsed payload of the last full response per URL (LRU),
+# so a 304 can reuse the payload without downloading it again
+_validators: OrderedDict[str, tuple[Optional[str], Optional[str], dict, int]] = OrderedDict()
+_validators_lock = threading.Lock()
+
+
+def _client_options() -> dict:
+    return {
+        "timeout": EA_REQUEST_TIMEOUT,
+        "limits": httpx.Limits(
+            max_connections=EA_MAX_CONNECTIONS,
+            max_keepalive_connections=EA_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=EA_KEEPALIVE_EXPIRY,
+        ),
+        "http2": _HTTP2_AVAILABLE,
+        "headers": {"Accept": "application/json"},
+    }
+
+
+def _get_client() -> httpx.Client:
+    """Get the shared EA client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Get the shared async EA client, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(**_client_options())
+    return _async_client
+
+
+def flush_cache():
+    """Write cache entries still waiting for the L2 backend."""
+    _cache.flush()
+
+
+def close_client():
+    """Close the shared sync EA client (on app shutdown)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def close_async_client():
+    """Close the shared async EA client (on app shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _count(host: str, counter: str, n: int = 1):
+    with _stats_lock:
+        _host_stats[host][counter] += n
+
+
+def _conditional_headers(request_key: str) -> dict:
+    """If-None-Match / If-Modified-Since for a URL fetched before."""
+    with _validators_lock:
+        entry = _validators.get(request_key)
+    if entry is None:
+        return {}
+    etag, last_modified, _, _ = entry
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _read_response(host: str, request_key: str, response: httpx.Response) -> dict:
+    """
+    Parsed payload of a response, reusing the stored one on 304.
+
+    Full responses that carry an ETag or Last-Modified are remembered
+    for the next conditional request to the same URL.
+    """
+    if response.status_code == 304:
+        return _not_modified(host, request_key)
+
+    response.raise_for_status()
+    payload = response.json()
+    _remember_response(host, request_key, response, payload, len(response.content))
+    return payload
+
+
+def _not_modified(host: str, request_key: str):
+    """Payload stored with the validators that just got a 304."""
+    with _validators_lock:
+        entry = _validators.get(request_key)
+        if entry is not None:
+            _validators.move_to_end(request_key)
+    if entry is None:
+        # Validators evicted since the request went out; treat as a failed fetch
+        raise EAApiError("EA API returned 304 for an unknown response")
+    _count(host, "responses")
+    _count(host, "not_modified")
+    _count(host, "bytes_saved", entry[3])
+    return entry[2]
+
+
+def _remember_response(host: str, request_key: str, response: httpx.Response, payload, size: int):
+    """Count a full response and keep its validators and payload for the next 304."""
+    _count(host, "responses")
+    _count(host, "bytes_received", size)
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    with _validators_lock:
+        if etag or last_modified:
+            _validators[request_key] = (etag, last_modified, payload, size)
+            _validators.move_to_end(request_key)
+            while len(_validators) > EA_VALIDATOR_MAX_URLS:
+                _validators.popitem(last=False)
+        else:
+            _validators.pop(request_key, None)
+
+
+def _connection_trace(host: str):
+    """httpcore trace hook that counts newly opened connections per host."""
+    def trace(event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            _count(host, "new_connections")
+    return trace
+
+
+def _async_connection_trace(host: str):
+    """Async flavour of _connection_trace, for the AsyncClient."""
+    async def trace(event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            _count(host, "new_connections")
+    return trace
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+def get_client_stats() -> dict:
+    """Connection reuse counters for the EA client per host, circuit states and cache counters."""
+    with _stats_lock:
+        hosts = {
+            host: {
+                **counts,
+                "reused": max(0, counts["requests"] - counts["new_connections"]),
+                "not_modified_ratio": round(counts["not_modified"] / counts["responses"], 3)
+                if counts["responses"] else 0.0,
+            }
+            for host, counts in _host_stats.items()
+        }
+    with _breakers_lock:
+        breakers = {endpoint: breaker.stats() for endpoint, breaker in _breakers.items()}
+    return {
+        "http2": _HTTP2_AVAILABLE,
+        "hosts": hosts,
+        "breakers": breakers,
+        "cache": _cache.stats(),
+        "readings_store": get_recorder_stats(),
+    }
+
+
 def _fetch(endpoint: str, params: dict = None) -> dict:
-    """Make HTTP request to EA API with error handling."""
-    url = f"{EA_BASE_URL}{endpoint}"
+    """
+    Make HTTP request to EA API with error handling.
 
+    Uses the shared keep-alive client, retrying timeouts, connection
+    errors and 5xx responses up to EA_MAX_RETRIES times with jittered
+    exponential backoff. Requests are conditional on the validators of
+    the last response for the same URL; a 304 returns its payload again.
+
+    Fails fast with EAApiError, without a request, while the endpoint's
+    circuit is open or once the caller's deadline budget is spent; the
+    per-attempt timeout and retries are cut to fit the remaining budget.
+    """
+    url = f"{EA_BASE_URL}{endpoint}"
+    host = urlsplit(url).netloc
+    request_key = str(httpx.URL(url, params=params))
+    breaker = _admit(endpoint, host, url)
+
+    for attempt in range(EA_MAX_RETRIES + 1):
+        try:
+            _count(host, "requests")
+            response = _get_client().get(
+                url,
+                params=params,
+                headers=_conditional_headers(request_key),
+                timeout=_request_timeout(),
+                extensions={"trace": _connection_trace(host)},
+            )
+            result = _read_response(host, request_key, response)
+            breaker.record_success()
+            return result
+        except Exception as e:
+            if attempt < EA_MAX_RETRIES and _is_retryable(e):
+                delay = _retry_delay(host, attempt, e, url)
+                if _budget_allows(delay):
+                    time.sleep(delay)
+                    continue
+            _record_outcome(breaker, e)
+            _raise_ea_error(e, url)
+
+
+async def _fetch_async(endpoint: str, params: dict = None) -> dict:
+    """Async version of _fetch, on the shared AsyncClient."""
+    url = f"{EA_BASE_URL}{endpoint}"
+    host = urlsplit(url).netloc
+    request_key = str(httpx.URL(url, params=params))
+    breaker = _admit(endpoint, host, url)
+
+    for attempt in range(EA_MAX_RETRIES + 1):
+        try:
+            _count(host, "requests")
+            response = await _get_async_client().get(
+                url,
+                params=params,
+                headers=_conditional_headers(request_key),
+                timeout=_request_timeout(),
+                extensions={"trace": _async_connection_trace(host)},
+            )
+            result = _read_response(host, request_key, response)
+            breaker.record_success()
+            return result
+        except Exception as e:
+            if attempt < EA_MAX_RETRIES and _is_retryable(e):
+                delay = _retry_delay(host, attempt, e, url)
+                if _budget_allows(delay):
+                    await asyncio.sleep(delay)
+                    continue
+            _record_outcome(breaker, e)
+            _raise_ea_error(e, url)
+
+
+def _fetch_readings(endpoint: str, params: dict = None, builder=ReadingSeriesBuilder):
+    """
+    _fetch for /readings endpoints, decoding the body as it streams in.
+
+    Items are parsed one at a time as chunks arrive and folded straight
+    into `builder()` (by default a ReadingSeries), so a multi-day window
+    or a national payload never exists as a parsed JSON document.
+    Retries, the circuit breaker, the deadline budget and conditional
+    requests work as in _fetch; on a 304 the result built from the last
+    full response is returned.
+    """
+    url = f"{EA_BASE_URL}{endpoint}"
+    host = urlsplit(url).netloc
+    request_key = str(httpx.URL(url, params=params))
+    breaker = _admit(endpoint, host, url)
+
+    for attempt in range(EA_MAX_RETRIES + 1):
+        try:
+            _count(host, "requests")
+            with _get_client().stream(
+                "GET",
+                url,
+                params=params,
+                headers=_conditional_headers(request_key),
+                timeout=_request_timeout(),
+                extensions={"trace": _connection_trace(host)},
+            ) as response:
+                if response.status_code == 304:
+                    result = _not_modified(host, request_key)
+                else:
+                    response.raise_for_status()
+                    parser, items = ItemsStreamParser(), builder()
+                    for text in response.iter_text():
+                        items.extend(parser.feed(text))
+                    items.extend(parser.close())
+                    result = items.build()
+                    _remember_response(host, request_key, response, result, response.num_bytes_downloaded)
+            breaker.record_success()
+            return result
+        except Exception as e:
+            if attempt < EA_MAX_RETRIES and _is_retryable(e):
+                delay = _retry_delay(host, attempt, e, url)
+                if _budget_allows(delay):
+                    time.sleep(delay)
+                    continue
+            _record_outcome(breaker, e)
+            _raise_ea_error(e, url)
+
+
+async def _fetch_readings_async(endpoint: str, params: dict = None, builder=ReadingSeriesBuilder):
+    """Async version of _fetch_readings, on the shared AsyncClient."""
+    url = f"{EA_BASE_URL}{endpoint}"
+    host = urlsplit(url).netloc
+    request_key = str(httpx.URL(url, params=params))
+    breaker = _admit(endpoint, host, url)
+
+    for attempt in range(EA_MAX_RETRIES + 1):
+        try:
+            _count(host, "requests")
+            async with _get_async_client().stream(
+                "GET",
+                url,
+                params=params,
+                headers=_conditional_headers(request_key),
+                timeout=_request_timeout(),
+                extensions={"trace": _async_connection_trace(host)},
+            ) as response:
+                if response.status_code == 304:
+                    result = _not_modified(host, request_key)
+                else:
+                    response.raise_for_status()
+                    parser, items = ItemsStreamParser(), builder()
+                    async for text in response.aiter_text():
+                        items.extend(parser.feed(text))
+                    items.extend(parser.close())
+                    result = items.build()
+                    _remember_response(host, request_key, response, result, response.num_bytes_downloaded)
+            breaker.record_success()
+            return result
+        except Exception as e:
+            if attempt < EA_MAX_RETRIES and _is_retryable(e):
+                delay = _retry_delay(host, attempt, e, url)
+                if _budget_allows(delay):
+                    await asyncio.sleep(delay)
+                    continue
+            _record_outcome(breaker, e)
+            _raise_ea_error(e, url)
+
+
+# Per-endpoint circuit breakers
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+# Monotonic deadline shared by every EA call in one request (see deadline_budget)
+_deadline: ContextVar[Optional[float]] = ContextVar("ea_deadline", default=None)
+
+
+@contextmanager
+def deadline_budget(seconds: float = EA_REQUEST_BUDGET):
+    """
+    Give every EA call made inside the block, including in tasks started
+    from it, one shared time budget. Nested budgets never extend an outer one.
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(deadline if outer is None else min(outer, deadline))
     try:
-        with httpx.Client(timeout=EA_REQUEST_TIMEOUT) as client:
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-    except httpx.TimeoutException:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _remaining_budget() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _request_timeout() -> float:
+    remaining = _remaining_budget()
+    if remaining is None:
+        return EA_REQUEST_TIMEOUT
+    return max(0.1, min(EA_REQUEST_TIMEOUT, remaining))
+
+
+def _budget_allows(delay: float) -> bool:
+    """Whether there is budget left for a retry after sleeping `delay`."""
+    remaining = _remaining_budget()
+    return remaining is None or remaining - delay > 0.1
+
+
+def _breaker(endpoint: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
+
+def _admit(endpoint: str, host: str, url: str) -> CircuitBreaker:
+    """Breaker for the endpoint, if the budget and circuit allow a call; else EAApiError."""
+    remaining = _remaining_budget()
+    if remaining is not None and remaining <= 0:
+        _count(host, "deadline_exceeded")
+        logger.warning(f"EA API deadline budget spent, skipping: {url}")
+        raise EAApiError("EA API deadline exceeded")
+
+    breaker = _breaker(endpoint)
+    if not breaker.allow():
+        _count(host, "short_circuited")
+        raise EAApiError(f"EA API circuit open for {endpoint}")
+    return breaker
+
+
+def _record_outcome(breaker: CircuitBreaker, error: Exception):
+    """Timeouts, connection errors and 5xx count against the circuit; EA answering does not."""
+    if _is_retryable(error):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def _retry_delay(host: str, attempt: int, error: Exception, url: str) -> float:
+    """Count and log a retry; returns the backoff (exponential, full jitter)."""
+    _count(host, "retries")
+    delay = random.uniform(0, EA_RETRY_BACKOFF * (2 ** attempt))
+    logger.warning(f"EA API attempt {attempt + 1} failed ({error!r}), retrying in {delay:.2f}s: {url}")
+    return delay
+
+
+def _raise_ea_error(error: Exception, url: str):
+    """Log a failed EA request and raise it as EAApiError."""
+    if isinstance(error, httpx.TimeoutException):
         logger.error(f"EA API timeout: {url}")
         raise EAApiError("EA API request timed out")
-    except httpx.HTTPStatusError as e:
-        logger.error(f"EA API HTTP error {e.response.status_code}: {url}")
-        raise EAApiError(f"EA API returned {e.response.status_code}")
-    except Exception as e:
-        logger.error(f"EA API unexpected error: {e}")
-        raise EAApiError("EA API unavailable")
+    if isinstance(error, httpx.HTTPStatusError):
+        logger.error(f"EA API HTTP error {error.response.status_code}: {url}")
+        raise EAApiError(f"EA API returned {error.response.status_code}")
+    logger.error(f"EA API unexpected error: {error}")
+    raise EAApiError("EA API unavailable")
+
+
+# Per-station river reading buffers, kept between refreshes
+_river_buffers: dict[str, RiverBuffer] = {}
+
+
+def _river_buffer(station_id: str) -> RiverBuffer:
+    buffer = _river_buffers.get(station_id)
+    if buffer is None:
+        buffer = _river_buffers.setdefault(station_id, RiverBuffer())
+        _seed_buffer(buffer, f"river_buffer_{station_id}")
+    return buffer
+
+
+def _seed_buffer(buffer, cache_key: str):
+    """Fill a new buffer from history another instance shared through the cache."""
+    series = _cache.peek(cache_key)
+    if series is not None:
+        buffer.extend(series)
+
+
+def _share_buffer(buffer, cache_key: str):
+    """Publish a buffer's history so cold instances can seed from it."""
+    _cache.set(cache_key, buffer.series, ttl=EA_CACHE_MAX_STALE)
+
+
+def _river_request(station_id: str) -> tuple[str, dict]:
+    """Readings since the newest one buffered (or the whole buffer window)."""
+    since = _river_buffer(station_id).since()
+    return f"/id/stations/{station_id}/readings", {"since": since.isoformat()}
+
+
+def _river_reading(station_id: str, readings: ReadingSeries) -> Optional[RiverReading]:
+    """Fold fetched readings into the station's buffer and read it back."""
+    buffer = _river_buffer(station_id)
+    _extend_river_buffer(station_id, buffer, readings)
+    return _buffered_reading(station_id, buffer)
+
+
+def _extend_river_buffer(station_id: str, buffer: RiverBuffer, readings: ReadingSeries):
+    if buffer.extend(readings):
+        _share_buffer(buffer, f"river_buffer_{station_id}")
+        record_readings("river", station_id, buffer)
+
+
+def _buffered_reading(station_id: str, buffer: RiverBuffer) -> Optional[RiverReading]:
+    """Latest reading, trend and staleness read off a station's buffer."""
+    latest = buffer.latest()
+    if latest is None:
+        return None
+
+    reading_time, value = latest
+    return RiverReading(
+        station_id=station_id,
+        station_name=RIVER_GAUGES.get(station_id, station_id),
+        value=value,
+        unit="m",
+        timestamp=reading_time,
+        trend=buffer.trend(),
+        is_stale=buffer.is_stale(),
+        rate_of_rise=buffer.rate_of_rise(),
+    )
+
+
+def _stale_river(cache_key: str) -> Optional[RiverReading]:
+    """Stale cached river reading for fallback, marked as delayed."""
+    stale = _cache.get_stale(cache_key)
+    if stale:
+        return replace(stale, is_stale=True)
+    return None
 
 
 def get_river_level(station_id: str = None) -> Optional[RiverReading]:
     """
     Fetch latest river level reading from Thame Bridge station.
 
-    Returns cached data if available and fresh.
+    Returns cached data if available and fresh. A single windowed fetch
+    provides the latest value, trend, rate of rise and staleness.
     """
     station_id = station_id or EA_THAME_BRIDGE_STATION_ID
     cache_key = f"river_{station_id}"
 
-    # Check cache first
-    cached = _cache.get(cache_key)
-    if cached:
-        return cached
+    try:
+        return _cache.get_or_load(
+            cache_key,
+            lambda: _river_reading(station_id, _fetch_readings(*_river_request(station_id))),
+        )
+
+    except EAApiError:
+        # Try to return stale cached data on error
+        return _stale_river(cache_key)
+
+
+async def get_river_level_async(
+    station_id: str = None,
+    use_cache: bool = True,
+) -> Optional[RiverReading]:
+    """Async get_river_level. use_cache=False always fetches (the poller)."""
+    station_id = station_id or EA_THAME_BRIDGE_STATION_ID
+    cache_key = f"river_{station_id}"
+
+    async def load():
+        return _river_reading(station_id, await _fetch_readings_async(*_river_request(station_id)))
 
     try:
-        # Fetch latest reading
-        data = _fetch(f"/id/stations/{station_id}/readings", {"latest": ""})
+        return await _cache.get_or_load_async(cache_key, load, refresh=not use_cache)
 
-        if not data.get("items"):
-            return None
+    except EAApiError:
+        return _stale_river(cache_key)
+
+
+def _latest_levels_request() -> tuple[str, dict]:
+    """Latest reading of every level measure in England, in one payload."""
+    return "/data/readings", {"latest": "", "parameter": "level"}
+
+
+class _LatestLevelsBuilder:
+    """
+    Collects the watched gauges' stage readings from a streamed bulk
+    latest-readings payload, dropping every other measure as it arrives.
+    """
+
+    def __init__(self):
+        self._columns: dict[str, tuple[list, list]] = {}
+
+    def extend(self, items: list[dict]):
+        for item in items:
+            # Measure ID looks like 1961TH-level-stage-i-15_min-mASD
+            measure_id = item.get("measure", "").split("/")[-1]
+            station_id, _, rest = measure_id.partition("-level-")
+            if station_id in RIVER_GAUGES and rest.startswith("stage-"):
+                date_times, values = self._columns.setdefault(station_id, ([], []))
+                date_times.append(item.get("dateTime"))
+                values.append(item.get("value"))
+
+    def build(self) -> dict[str, ReadingSeries]:
+        return {
+            station_id: ReadingSeries.from_columns(date_times, values)
+            for station_id, (date_times, values) in self._columns.items()
+        }
+
+
+def _gauge_readings(latest: dict[str, ReadingSeries]) -> dict[str, RiverReading]:
+    """
+    Fan the bulk latest readings out to the watched gauges.
+
+    Each gauge's readings are appended to its buffer and a RiverReading
+    is built from the buffer, so trends build up across polls without
+    per-station requests.
+    """
+    readings = {}
+    for station_id, series in latest.items():
+        buffer = _river_buffer(station_id)
+        _extend_river_buffer(station_id, buffer, series)
+        reading = _buffered_reading(station_id, buffer)
+        if reading is not None:
+            readings[station_id] = reading
+    return readings
+
+
+def _stale_gauges(cache_key: str) -> dict[str, RiverReading]:
+    """Stale cached gauge readings for fallback, marked as delayed."""
+    stale = _cache.get_stale(cache_key) or {}
+    return {station_id: replace(reading, is_stale=True) for station_id, reading in stale.items()}
+
+
+def get_river_gauges() -> dict[str, RiverReading]:
+    """
+    Latest reading for every gauge in RIVER_GAUGES, keyed by station ID.
 
-        reading = data["items"][0]
-        reading_time = datetime.fromisoformat(
-            reading["dateTime"].replace("Z", "+00:00")
+    One bulk /data/readings?latest call serves all gauges, Thame Bridge
+    included, and is cached under a single key, so watching more gauges
+    costs no extra requests. The national payload is decoded as it
+    streams in and only the watched gauges' readings are kept.
+    """
+    cache_key = "river_gauges_latest"
+    try:
+        return _cache.get_or_load(
+            cache_key,
+            lambda: _gauge_readings(_fetch_readings(*_latest_levels_request(), builder=_LatestLevelsBuilder)),
         )
 
-        # Check if data is stale (> 1 hour old)
-        age = datetime.now(timezone.utc) - reading_time
-        is_stale = age > timedelta(hours=1)
-
-        # Calculate trend from recent readings
-        trend = _calculate_trend(station_id)
-
-        result = RiverReading(
-            station_id=station_id,
-            station_name="Thame Bridge",
-            value=reading["value"],
-            unit="m",
-            timestamp=reading_time,
-            trend=trend,
-            is_stale=is_stale,
+    except EAApiError:
+        return _stale_gauges(cache_key)
+
+
+async def get_river_gauges_async(use_cache: bool = True) -> dict[str, RiverReading]:
+    """Async get_river_gauges. use_cache=False always fetches (the poller)."""
+    cache_key = "river_gauges_latest"
+
+    async def load():
+        return _gauge_readings(
+            await _fetch_readings_async(*_latest_levels_request(), builder=_LatestLevelsBuilder)
         )
 
-        _cache.set(cache_key, result)
-        return result
+    try:
+        return await _cache.get_or_load_async(cache_key, load, refresh=not use_cache)
 
     except EAApiError:
-        # Try to return stale cached data on error
-        stale = _cache.get_stale(cache_key)
-        if stale:
-            stale.is_stale = True
-            return stale
-        return None
+        return _stale_gauges(cache_key)
 
 
-def _calculate_trend(station_id: str) -> Optional[str]:
-    """Calculate river level trend from recent readings."""
-    try:
-        since = (datetime.now(timezone.utc) - timedelta(hours=3)).isoformat()
-        data = _fetch(f"/id/stations/{station_id}/readings", {"since": since})
+def _station_catalogue_request() -> tuple[str, dict]:
+    return "/id/stations", {"parameter": "rainfall", "_limit": STATION_CATALOGUE_LIMIT}
 
-        if not data.get("items") or len(data["items"]) < 2:
-            return None
 
-        # Sort by time descending
-        readings = sorted(
-            data["items"],
-            key=lambda x: x["dateTime"],
-            reverse=True
-        )
+def _first(value):
+    """EA returns a list for the odd field on merged stations; take the first."""
+    return value[0] if isinstance(value, list) and value else value
 
-        latest = readings[0]["value"]
-        previous = readings[min(1, len(readings) - 1)]["value"]
-        delta = latest - previous
 
-        if delta >= 0.02:
-            return "rising"
-        elif delta <= -0.02:
-            return "falling"
-        else:
-            return "steady"
+def _parse_station_catalogue(data: dict) -> list[list]:
+    """[station_id, label, lat, lon] for every station in a /id/stations payload."""
+    stations = []
+    for item in data.get("items", []):
+        # Station ID is in the @id URL, extract last segment
+        station_id = item.get("@id", "").split("/")[-1]
+        lat, lon = _first(item.get("lat")), _first(item.get("long"))
+        if station_id and lat is not None and lon is not None:
+            stations.append([station_id, str(_first(item.get("label")) or station_id), float(lat), float(lon)])
+    return stations
 
-    except Exception as e:
-        logger.warning(f"Could not calculate trend: {e}")
-        return None
 
+# Index over the current catalogue, rebuilt when the catalogue is replaced
+_station_index: Optional[tuple[list, StationIndex]] = None
+
+
+def _index_for(catalogue: Optional[list]) -> Optional[StationIndex]:
+    global _station_index
+    if not catalogue:
+        # EA down and nothing cached: keep using the last catalogue we had
+        return _station_index[1] if _station_index else None
+    if _station_index is None or _station_index[0] is not catalogue:
+        stations = [Station(*entry) for entry in catalogue]
+        _station_index = (catalogue, StationIndex(stations))
+        logger.info(f"Indexed {len(stations)} rainfall stations")
+    return _station_index[1]
+
+
+def _nearest_station_ids(
+    catalogue: Optional[list],
+    lat: float,
+    lon: float,
+    n: int,
+    max_km: float,
+) -> list[str]:
+    index = _index_for(catalogue)
+    if index is None:
+        return []
+    return [station.station_id for station in index.nearest(lat, lon, n, max_km)]
 
-def get_rainfall_stations() -> list[str]:
-    """
-    Find nearest rainfall stations to Shabbington.
 
-    Returns list of station IDs.
+def get_rainfall_stations(
+    lat: float = SHABBINGTON_LAT,
+    lon: float = SHABBINGTON_LON,
+    n: int = RAINFALL_NUM_STATIONS,
+    max_km: float = RAINFALL_SEARCH_DIST_KM,
+) -> list[str]:
     """
-    cache_key = "rainfall_stations"
-    cached = _cache.get(cache_key)
-    if cached:
-        return cached
+    Find the nearest rainfall stations to a location (Shabbington by default).
 
+    Searches the EA station catalogue locally; the catalogue itself is
+    fetched once a day and shared through the L2 cache.
+
+    Returns list of station IDs, closest first.
+    """
+    cache_key = "station_catalogue_rainfall"
     try:
-        data = _fetch("/id/stations", {
-            "parameter": "rainfall",
-            "lat": SHABBINGTON_LAT,
-            "long": SHABBINGTON_LON,
-            "dist": RAINFALL_SEARCH_DIST_KM,
-        })
-
-        if not data.get("items"):
-            return []
-
-        # Extract station IDs (take first N)
-        station_ids = []
-        for item in data["items"][:RAINFALL_NUM_STATIONS]:
-            # Station ID is in the @id URL, extract last segment
-            station_url = item.get("@id", "")
-            station_id = station_url.split("/")[-1]
-            if station_id:
-                station_ids.append(station_id)
-
-        _cache.set(cache_key, station_ids)
-        return station_ids
+        catalogue = _cache.get_or_load(
+            cache_key,
+            lambda: _parse_station_catalogue(_fetch(*_station_catalogue_request())),
+            ttl=STATION_CATALOGUE_TTL,
+        )
+    except EAApiError:
+        catalogue = _cache.get_stale(cache_key)
+    return _nearest_station_ids(catalogue, lat, lon, n, max_km)
+
+
+async def get_rainfall_stations_async(
+    lat: float = SHABBINGTON_LAT,
+    lon: float = SHABBINGTON_LON,
+    n: int = RAINFALL_NUM_STATIONS,
+    max_km: float = RAINFALL_SEARCH_DIST_KM,
+) -> list[str]:
+    """Async get_rainfall_stations."""
+    cache_key = "station_catalogue_rainfall"
 
+    async def load():
+        return _parse_station_catalogue(await _fetch_async(*_station_catalogue_request()))
+
+    try:
+        catalogue = await _cache.get_or_load_async(cache_key, load, ttl=STATION_CATALOGUE_TTL)
     except EAApiError:
-        return _cache.get_stale(cache_key) or []
+        catalogue = _cache.get_stale(cache_key)
+    return _nearest_station_ids(catalogue, lat, lon, n, max_km)
+
+
+# Per-station rainfall buffers, kept between refreshes
+_rainfall_buffers: dict[str, RainfallBuffer] = {}
+
+
+def _rainfall_buffer(station_id: str) -> RainfallBuffer:
+    buffer = _rainfall_buffers.get(station_id)
+    if buffer is None:
+        buffer = _rainfall_buffers.setdefault(station_id, RainfallBuffer())
+        _seed_buffer(buffer, f"rain_buffer_{station_id}")
+    return buffer
+
+
+def _rainfall_request(station_id: str) -> tuple[str, dict]:
+    """Readings since the newest one buffered (or the full history window)."""
+    since = _rainfall_buffer(station_id).since()
+    return f"/id/stations/{station_id}/readings", {"since": since.isoformat()}
+
+
+def _rainfall_total(station_id: str, readings: ReadingSeries) -> Optional[RainfallTotal]:
+    """Append fetched readings to the station's buffer and read window totals off it."""
+    buffer = _rainfall_buffer(station_id)
+    now = datetime.now(timezone.utc)
+    if buffer.extend(readings, now):
+        _share_buffer(buffer, f"rain_buffer_{station_id}")
+        record_readings("rainfall", station_id, buffer)
+
+    last_time = buffer.last_reading_time
+    if last_time is None:
+        return None
+
+    windows = [24, 48, 72] + RAINFALL_WINDOWS_HOURS
+    sums = [None if total is None else round(total, 1) for total in buffer.totals(windows, now)]
+
+    return RainfallTotal(
+        station_id=station_id,
+        total_24h=sums[0],
+        total_48h=sums[1],
+        total_72h=sums[2],
+        last_reading_time=last_time,
+        totals=dict(zip(RAINFALL_WINDOWS_HOURS, sums[3:])),
+    )
 
 
 def get_rainfall_total(station_id: str) -> Optional[RainfallTotal]:
     """Fetch rainfall totals for a single station."""
     cache_key = f"rain_{station_id}"
-    cached = _cache.get(cache_key)
-    if cached:
-        return cached
-
     try:
-        since = (datetime.now(timezone.utc) - timedelta(hours=72)).isoformat()
-        data = _fetch(f"/id/stations/{station_id}/readings", {"since": since})
+        return _cache.get_or_load(
+            cache_key,
+            lambda: _rainfall_total(station_id, _fetch_readings(*_rainfall_request(station_id))),
+        )
 
-        if not data.get("items"):
-            return None
+    except EAApiError:
+        return _cache.get_stale(cache_key)
 
-        now = datetime.now(timezone.utc)
-        total_24h = 0.0
-        total_48h = 0.0
-        total_72h = 0.0
-        last_time = None
 
-        for reading in data["items"]:
-            reading_time = datetime.fromisoformat(
-                reading["dateTime"].replace("Z", "+00:00")
-            )
-            age = now - reading_time
-            value = reading.get("value", 0)
-
-            if value and value > 0:
-                if age <= timedelta(hours=24):
-                    total_24h += value
-                if age <= timedelta(hours=48):
-                    total_48h += value
-                if age <= timedelta(hours=72):
-                    total_72h += value
-
-            if last_time is None or reading_time > last_time:
-                last_time = reading_time
-
-        result = RainfallTotal(
-            station_id=station_id,
-            total_24h=round(total_24h, 1),
-            total_48h=round(total_48h, 1),
-            total_72h=round(total_72h, 1),
-            last_reading_time=last_time,
-        )
+async def get_rainfall_total_async(station_id: str, use_cache: bool = True) -> Optional[RainfallTotal]:
+    """Async get_rainfall_total. use_cache=False always fetches (the poller)."""
+    cache_key = f"rain_{station_id}"
+
+    async def load():
+        return _rainfall_total(station_id, await _fetch_readings_async(*_rainfall_request(station_id)))
 
-        _cache.set(cache_key, result)
-        return result
+    try:
+        return await _cache.get_or_load_async(cache_key, load, refresh=not use_cache)
 
     except EAApiError:
         return _cache.get_stale(cache_key)
 
 
+def _median(values: list[Optional[float]]) -> Optional[float]:
+    """Median of the values that are known; None if none are."""
+    sorted_vals = sorted(v for v in values if v is not None)
+    n = len(sorted_vals)
+    if n == 0:
+        return None
+    if n % 2 == 0:
+        return (sorted_vals[n // 2 - 1] + sorted_vals[n // 2]) / 2
+    return sorted_vals[n // 2]
+
+
+def _aggregate_rainfall(
+    station_ids: list[str],
+    totals: list[RainfallTotal],
+) -> tuple[Optional[float], Optional[float], Optional[float], str]:
+    """Median totals across stations, flagged partial if any station is missing."""
+    if not totals:
+        return None, None, None, "missing"
+
+    rain_24h = _median([t.total_24h for t in totals])
+    rain_48h = _median([t.total_48h for t in totals])
+    rain_72h = _median([t.total_72h for t in totals])
+
+    quality = "ok" if len(totals) == len(station_ids) else "partial"
+
+    return rain_24h, rain_48h, rain_72h, quality
+
+
 def get_aggregated_rainfall() -> tuple[Optional[float], Optional[float], Optional[float], str]:
     """
     Get aggregated rainfall from all nearby stations.
@@ -271,32 +1180,181 @@ def get_aggregated_rainfall() -> tuple[Optional[float], Optional[float], Optiona
         if total:
             totals.append(total)
 
-    if not totals:
+    return _aggregate_rainfall(station_ids, totals)
+
+
+async def get_aggregated_rainfall_async(
+    deadline: float = EA_RAINFALL_DEADLINE,
+    use_cache: bool = True,
+) -> tuple[Optional[float], Optional[float], Optional[float], str]:
+    """
+    Async get_aggregated_rainfall; fetches every station concurrently.
+
+    `deadline` seconds covers station discovery and the station fetches
+    together. If discovery overruns it the result is "missing" (the
+    catalogue load carries on and fills the cache for the next call);
+    stations that have not answered in the time left are dropped and the
+    result is flagged "partial". use_cache=False refetches each station's
+    readings (the station list may still come from the cache).
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        station_ids = await asyncio.wait_for(
+            asyncio.shield(asyncio.ensure_future(get_rainfall_stations_async())),
+            timeout=deadline,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Rainfall deadline hit during station discovery ({deadline}s)")
+        return None, None, None, "missing"
+    if not station_ids:
         return None, None, None, "missing"
 
-    # Use median of totals
-    def median(values):
-        sorted_vals = sorted(values)
-        n = len(sorted_vals)
-        if n == 0:
-            return None
-        if n % 2 == 0:
-            return (sorted_vals[n // 2 - 1] + sorted_vals[n // 2]) / 2
-        return sorted_vals[n // 2]
+    remaining = max(deadline - (loop.time() - started), 0)
+    tasks = [asyncio.create_task(get_rainfall_total_async(sid, use_cache)) for sid in station_ids]
+    done, pending = await asyncio.wait(tasks, timeout=remaining)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning(f"Rainfall deadline hit: {len(pending)} of {len(tasks)} stations dropped")
 
-    rain_24h = median([t.total_24h for t in totals])
-    rain_48h = median([t.total_48h for t in totals])
-    rain_72h = median([t.total_72h for t in totals])
+    totals = [
+        task.result()
+        for task in done
+        if not task.exception() and task.result()
+    ]
 
-    quality = "ok" if len(totals) == len(station_ids) else "partial"
+    return _aggregate_rainfall(station_ids, totals)
 
-    return rain_24h, rain_48h, rain_72h, quality
+
+def get_reading_history(kind: str, station_id: str, hours: float = 24) -> ReadingSeries:
+    """
+    Readings for a station over the last `hours`, from Postgres first.
+
+    kind is "river" or "rainfall". If the stored readings do not reach
+    both ends of the window (within READINGS_HISTORY_GAP_HOURS), the window
+    is fetched from EA, stored, and merged with what was stored.
+    """
+    now = datetime.now(timezone.utc)
+    start = now - timedelta(hours=hours)
+    gap = timedelta(hours=READINGS_HISTORY_GAP_HOURS)
+
+    stored = ReadingSeries.empty()
+    if READINGS_STORE_ENABLED:
+        try:
+            stored = load_readings(kind, station_id, start)
+        except Exception as e:
+            logger.error(f"Loading stored {kind} readings failed: {e}")
+
+    if len(stored) and stored.first_time <= start + gap and stored.last_time >= now - gap:
+        return stored
+
+    try:
+        fetched = _fetch_readings(
+            f"/id/stations/{station_id}/readings",
+            {"since": start.isoformat(), "_limit": math.ceil(hours * READINGS_FETCH_PER_HOUR)},
+        )
+    except EAApiError:
+        return stored
+
+    if READINGS_STORE_ENABLED:
+        try:
+            store_series(kind, station_id, fetched)
+        except Exception as e:
+            logger.error(f"Storing fetched {kind} readings failed: {e}")
+    return stored.merge(fetched)
+
+
+def _stored_readings(kind: str, station_id: str, since: datetime, until: datetime) -> ReadingSeries:
+    """Stored readings for a past window, or none if the store is off or unreachable."""
+    if not READINGS_STORE_ENABLED:
+        return ReadingSeries.empty()
+    try:
+        return load_readings(kind, station_id, since, until)
+    except Exception as e:
+        logger.error(f"Loading stored {kind} readings failed: {e}")
+        return ReadingSeries.empty()
+
+
+def conditions_at(
+    when: datetime,
+) -> tuple[Optional[float], Optional[float], Optional[float], Optional[float], bool]:
+    """
+    River level and median rainfall totals at a past time.
+
+    Read from the in-memory buffers, or from the stored readings where a
+    buffer does not span the window (a cold instance, or an older report).
+
+    Returns: (river_level, 24h_total, 48h_total, 72h_total, complete)
+    complete is False unless every gauge's readings span the whole window
+    (`when` for the river, the 72 hours up to `when` for rainfall), i.e.
+    while missing or later readings could still change the values.
+    """
+    slack = timedelta(hours=RIVER_ENRICH_TOLERANCE_HOURS)
+
+    river = _river_buffer(EA_THAME_BRIDGE_STATION_ID)
+    if not river.series.covers(when):
+        series = _stored_readings(
+            "river", EA_THAME_BRIDGE_STATION_ID, when - slack, when + slack,
+        ).merge(river.series)
+        river = RiverBuffer(max_readings=max(len(series), 1))
+        river.extend(series)
+    river_level = river.level_at(when)
+    complete = river.series.covers(when)
+
+    rain_start = when - timedelta(hours=72)
+    station_ids = _nearest_station_ids(
+        _cache.peek("station_catalogue_rainfall"),
+        SHABBINGTON_LAT,
+        SHABBINGTON_LON,
+        RAINFALL_NUM_STATIONS,
+        RAINFALL_SEARCH_DIST_KM,
+    ) or list(_rainfall_buffers)
+    totals = []
+    for station_id in station_ids:
+        buffer = _rainfall_buffer(station_id)
+        if not buffer.series.covers(rain_start, when):
+            series = _stored_readings(
+                "rainfall", station_id, rain_start - slack, when + slack,
+            ).merge(buffer.series)
+            buffer = RainfallBuffer()
+            buffer.extend(series, now=when)
+        complete = complete and buffer.series.covers(rain_start, when)
+        totals.append(buffer.totals([24, 48, 72], when))
+    if not station_ids:
+        complete = False
+
+    medians = [_median([t[i] for t in totals]) for i in range(3)]
+    rain = [None if m is None else round(m, 1) for m in medians]
+    return river_level, rain[0], rain[1], rain[2], complete
+
+
+def get_river_and_gauges() -> tuple[Optional[RiverReading], tuple]:
+    """
+    Thame Bridge reading and the watched gauges' readings.
+
+    With extra gauges watched, the bulk latest-readings call serves the
+    Thame Bridge card too; otherwise it is fetched on its own.
+    """
+    if len(RIVER_GAUGES) < 2:
+        return get_river_level(), ()
+    gauges = get_river_gauges()
+    return gauges.get(EA_THAME_BRIDGE_STATION_ID), tuple(gauges.values())
+
+
+async def get_river_and_gauges_async(use_cache: bool = True) -> tuple[Optional[RiverReading], tuple]:
+    """Async get_river_and_gauges. use_cache=False always fetches (the poller)."""
+    if len(RIVER_GAUGES) < 2:
+        return await get_river_level_async(use_cache=use_cache), ()
+    gauges = await get_river_gauges_async(use_cache=use_cache)
+    return gauges.get(EA_THAME_BRIDGE_STATION_ID), tuple(gauges.values())
 
 
 def get_live_conditions() -> LiveConditions:
-    """Get all live conditions in one call."""
-    river = get_river_level()
-    rain_24h, rain_48h, rain_72h, rain_quality = get_aggregated_rainfall()
+    """Get all live conditions in one call, within one EA_REQUEST_BUDGET."""
+    with deadline_budget():
+        river, gauges = get_river_and_gauges()
+        rain_24h, rain_48h, rain_72h, rain_quality = get_aggregated_rainfall()
 
     return LiveConditions(
         river=river,
@@ -305,4 +1363,5 @@ def get_live_conditions() -> LiveConditions:
         rainfall_72h=rain_72h,
         rain_data_quality=rain_quality,
         generated_at_utc=datetime.now(timezone.utc),
+        gauges=gauges,
     )
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import logging
+
+from psycopg2.extras import execute_values
+
+from app.config import ENRICH_BATCH_SIZE, ENRICH_MAX_WAIT_HOURS
+from app.database import get_db_cursor
+from app.services.ea_api import conditions_at
+
+logger = logging.getLogger(__name__)
+
+
+def enrich_observations(limit: int = ENRICH_BATCH_SIZE, now: Optional[datetime] = None) -> int:
+    """
+    Fill river and rainfall columns on reports saved without them.
+
+    Reports are written immediately on submit; this fills in the river
+    level nearest the report time and the rainfall totals ending at it,
+    from the reading buffers or the stored readings, in one batched
+    UPDATE. A report waits until every gauge's readings span its window,
+    or ENRICH_MAX_WAIT_HOURS, after which whatever values are known are
+    written and it is marked done; columns with no data stay NULL, so
+    the give-up is recorded and never retried. Values already set are
+    never overwritten.
+
+    Returns the number of reports enriched.
+    """
+    now = now or datetime.now(timezone.utc)
+    give_up_before = now - timedelta(hours=ENRICH_MAX_WAIT_HOURS)
+
+    with get_db_cursor() as cur:
+        cur.execute("""
+            SELECT id, timestamp_utc
+            FROM observations
+            WHERE env_enriched_at IS NULL
+            ORDER BY timestamp_utc
+            LIMIT %s
+        """, (limit,))
+        pending = cur.fetchall()
+
+        rows = []
+        for row in pending:
+            river_level, rain_24h, rain_48h, rain_72h, complete = conditions_at(row["timestamp_utc"])
+            if complete or row["timestamp_utc"] < give_up_before:
+                rows.append((str(row["id"]), river_level, rain_24h, rain_48h, rain_72h))
+
+        if rows:
+            execute_values(cur, """
+                UPDATE observations AS o
+                SET river_level_m = COALESCE(o.river_level_m, v.river_level_m),
+                    rainfall_24h_mm = COALESCE(o.rainfall_24h_mm, v.rainfall_24h_mm),
+                    rainfall_48h_mm = COALESCE(o.rainfall_48h_mm, v.rainfall_48h_mm),
+                    rainfall_72h_mm = COALESCE(o.rainfall_72h_mm, v.rainfall_72h_mm),
+                    env_enriched_at = NOW()
+                FROM (VALUES %s) AS v(id, river_level_m, rainfall_24h_mm, rainfall_48h_mm, rainfall_72h_mm)
+                WHERE o.id = v.id
+            """, rows, template="(%s::uuid, %s::numeric, %s::numeric, %s::numeric, %s::numeric)")
+
+    if rows:
+        logger.info(f"Enriched {len(rows)} of {len(pending)} pending observations")
+    return len(rows)
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+import logging
+
+from fasthtml.common import NotStr, to_xml
+
+from app.config import FRAGMENT_CACHE_MAX_ENTRIES, FRAGMENT_TIME_BUCKET_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class FragmentCache:
+    """
+    Rendered HTML of the road, river and rainfall cards.
+
+    Entries are keyed by fragment name (e.g. "road:ICKFORD_ENTRANCE"), a
+    data version and the current time bucket. The cards print relative
+    times, so a fragment is re-rendered at least once per bucket even if
+    its data has not changed. Least recently used entries are evicted
+    beyond max_entries; invalidate() drops every entry for a name.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = FRAGMENT_CACHE_MAX_ENTRIES,
+        bucket_seconds: float = FRAGMENT_TIME_BUCKET_SECONDS,
+    ):
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._max_entries = max_entries
+        self._bucket_seconds = bucket_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get_or_render(self, name: str, version: Hashable, render: Callable) -> NotStr:
+        """Cached HTML for (name, version), or render() serialised and stored."""
+        key = (name, version, int(time.time() // self._bucket_seconds))
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return NotStr(html)
+            self._stats["misses"] += 1
+
+        html = to_xml(render())
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return NotStr(html)
+
+    def invalidate(self, name: str):
+        """Drop every cached version of a fragment."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == name]
+            for key in stale:
+                del self._entries[key]
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self._max_entries}
+
+
+# Process-wide fragment cache shared by the page and HTMX routes
+_fragments = FragmentCache()
+
+
+def cached_fragment(name: str, version: Hashable, render: Callable) -> NotStr:
+    return _fragments.get_or_render(name, version, render)
+
+
+def invalidate_fragment(name: str):
+    _fragments.invalidate(name)
+
+
+def get_fragment_stats() -> dict:
+    return _fragments.stats()
@@ -0,0 +1,116 @@
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class ItemsStreamParser:
+    """
+    Incremental parser for EA list payloads: {"meta": {...}, "items": [...]}.
+
+    Text is fed in as it arrives from the network and each complete
+    element of the top-level "items" array is returned as soon as it has
+    been read, so only one element and one network chunk are held at a
+    time however long the array is. Other top-level members (small, like
+    "meta") are parsed and discarded. Elements are decoded with the stdlib
+    JSON decoder; only the surrounding structure is tracked here.
+    """
+
+    def __init__(self, key: str = "items"):
+        self._key = key
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._state = "object"
+        self._member = None
+
+    def feed(self, text: str) -> list:
+        """Add the next chunk of text; returns the items it completed."""
+        self._buf += text
+        return self._drain(final=False)
+
+    def close(self) -> list:
+        """Finish the document; raises ValueError if it was cut short."""
+        items = self._drain(final=True)
+        if self._state != "done":
+            raise ValueError("JSON document ended early")
+        return items
+
+    def _decode(self, buf: str, pos: int, final: bool):
+        """(value, end) for the value at pos, or None if it may not be complete yet."""
+        try:
+            value, end = self._decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # A number at the very end of the buffer may continue in the next chunk
+        if end == len(buf) and not final:
+            return None
+        return value, end
+
+    def _drain(self, final: bool) -> list:
+        items = []
+        buf, pos = self._buf, 0
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            char, state = buf[pos], self._state
+
+            if state == "done":
+                raise ValueError(f"Unexpected {char!r} after JSON document")
+            if state == "object":
+                self._expect(char, "{")
+                pos, self._state = pos + 1, "key"
+            elif state == "key":
+                if char == "}":
+                    pos, self._state = pos + 1, "done"
+                    continue
+                decoded = self._decode(buf, pos, final)
+                if decoded is None:
+                    break
+                self._member, pos = decoded
+                if not isinstance(self._member, str):
+                    raise ValueError("JSON object key is not a string")
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(char, ":")
+                pos += 1
+                self._state = "items" if self._member == self._key else "value"
+            elif state == "items":
+                if char != "[":
+                    self._state = "value"  # e.g. "items": null
+                    continue
+                pos, self._state = pos + 1, "item"
+            elif state == "item":
+                if char == "]":
+                    pos, self._state = pos + 1, "member_end"
+                    continue
+                decoded = self._decode(buf, pos, final)
+                if decoded is None:
+                    break
+                item, pos = decoded
+                items.append(item)
+                self._state = "item_end"
+            elif state == "item_end":
+                self._expect(char, ",]")
+                pos += 1
+                self._state = "item" if char == "," else "member_end"
+            elif state == "value":
+                decoded = self._decode(buf, pos, final)
+                if decoded is None:
+                    break
+                _, pos = decoded
+                self._state = "member_end"
+            elif state == "member_end":
+                self._expect(char, ",}")
+                pos += 1
+                self._state = "key" if char == "," else "done"
+
+        self._buf = buf[pos:]
+        return items
+
+    @staticmethod
+    def _expect(char: str, allowed: str):
+        if char not in allowed:
+            raise ValueError(f"Unexpected {char!r} in JSON document, expected one of {allowed!r}")
@@ -0,0 +1,174 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+import logging
+
+from app.config import (
+    DATABASE_URL,
+    EA_POLL_INTERVAL,
+    EA_REQUEST_BUDGET,
+    EA_SNAPSHOT_DELAYED_AGE,
+)
+from app.models.domain import LiveConditions
+from app.services.ea_api import (
+    deadline_budget,
+    get_river_and_gauges_async,
+    get_aggregated_rainfall_async,
+)
+from app.services.enrichment import enrich_observations
+
+logger = logging.getLogger(__name__)
+
+# Latest published snapshot. Replaced whole on each refresh, never mutated,
+# so request handlers (including sync ones on worker threads) just read it.
+_snapshot: Optional[LiveConditions] = None
+
+_task: Optional[asyncio.Task] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_wake: Optional[asyncio.Event] = None
+
+# Refresh started by a request that found no snapshot, shared by the others
+_cold_refresh: Optional[asyncio.Task] = None
+
+
+def get_snapshot() -> Optional[LiveConditions]:
+    """
+    Latest live conditions, or None before the first refresh.
+
+    Never waits on the EA API. If there is no snapshot yet or it is older
+    than the poll interval (e.g. the process was suspended), the poller
+    is woken to refresh it in the background.
+    """
+    snapshot = _snapshot
+    age = snapshot_age()
+    if age is None or age > EA_POLL_INTERVAL:
+        _request_refresh()
+    return snapshot
+
+
+async def get_snapshot_async() -> Optional[LiveConditions]:
+    """
+    get_snapshot() for async handlers, serving the first request with data.
+
+    With no snapshot yet (a cold instance, or a serverless one whose
+    poller is frozen between invocations) this waits for one refresh from
+    the response cache, shared by concurrent requests and bounded by
+    EA_REQUEST_BUDGET. Returns None only if that refresh fails.
+    """
+    global _cold_refresh
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot
+
+    loop = asyncio.get_running_loop()
+    if _cold_refresh is None or _cold_refresh.done() or _cold_refresh.get_loop() is not loop:
+        _cold_refresh = loop.create_task(refresh(use_cache=True))
+    try:
+        return await asyncio.wait_for(asyncio.shield(_cold_refresh), timeout=EA_REQUEST_BUDGET)
+    except Exception as e:
+        logger.warning(f"First live conditions refresh failed: {e}")
+        return _snapshot
+
+
+def snapshot_age(now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds since the current snapshot was generated."""
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    return (now - snapshot.generated_at_utc).total_seconds()
+
+
+def is_delayed(now: Optional[datetime] = None) -> bool:
+    """True if the snapshot is older than EA_SNAPSHOT_DELAYED_AGE."""
+    age = snapshot_age(now)
+    return age is not None and age > EA_SNAPSHOT_DELAYED_AGE
+
+
+async def refresh(use_cache: bool = False) -> LiveConditions:
+    """
+    Fetch river and rainfall and publish a new snapshot.
+
+    Normally bypasses the response cache. The poller's first refresh uses
+    it, so a cold instance starts from data another instance shared.
+
+    If the EA API returned nothing at all the previous snapshot is kept,
+    so its age keeps growing and the cards show it as delayed.
+    """
+    global _snapshot
+
+    with deadline_budget():
+        (river, gauges), (rain_24h, rain_48h, rain_72h, rain_quality) = await asyncio.gather(
+            get_river_and_gauges_async(use_cache=use_cache),
+            get_aggregated_rainfall_async(use_cache=use_cache),
+        )
+
+    if river is None and rain_quality == "missing" and _snapshot is not None:
+        logger.warning("Live conditions refresh got no data, keeping previous snapshot")
+        return _snapshot
+
+    _snapshot = LiveConditions(
+        river=river,
+        rainfall_24h=rain_24h,
+        rainfall_48h=rain_48h,
+        rainfall_72h=rain_72h,
+        rain_data_quality=rain_quality,
+        generated_at_utc=datetime.now(timezone.utc),
+        gauges=gauges,
+    )
+    return _snapshot
+
+
+async def _run(interval: float):
+    use_cache = True
+    while True:
+        try:
+            await refresh(use_cache)
+            use_cache = False
+        except Exception as e:
+            logger.error(f"Live conditions refresh failed: {e}")
+
+        if DATABASE_URL:
+            # Backfill reports from the readings just fetched
+            try:
+                await asyncio.to_thread(enrich_observations)
+            except Exception as e:
+                logger.error(f"Observation enrichment failed: {e}")
+
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+
+def start_poller(interval: float = EA_POLL_INTERVAL):
+    """Start the background refresher on the running event loop."""
+    global _task, _loop, _wake
+    if _task is not None and not _task.done():
+        return
+    _loop = asyncio.get_running_loop()
+    _wake = asyncio.Event()
+    _task = asyncio.create_task(_run(interval))
+    logger.info(f"Live conditions poller started, refreshing every {interval}s")
+
+
+async def stop_poller():
+    """Cancel the background refresher."""
+    global _task, _loop, _wake
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task, _loop, _wake = None, None, None
+
+
+def _request_refresh():
+    """Wake the poller early. Safe to call from any thread."""
+    loop, wake = _loop, _wake
+    if loop is None or wake is None or loop.is_closed():
+        return
+    loop.call_soon_threadsafe(wake.set)
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+import logging
+
+from app.config import (
+    WRITE_BEHIND_MAX_QUEUE,
+    WRITE_BEHIND_BATCH_SIZE,
+    WRITE_BEHIND_FLUSH_MS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ObservationWriter:
+    """
+    Write-behind queue that groups report inserts into batches.
+
+    submit() puts a row on a bounded queue and returns a Future. A flusher
+    thread collects rows until it has batch_size of them or flush_ms has
+    passed since the first, and hands the batch to flush_batch, which
+    writes it in one transaction and returns one result per row. Futures
+    resolve only after that transaction commits, so a caller that waits
+    on its Future has a durable acknowledgement. If the batch fails, every
+    Future in it gets the exception. A Future cancelled before its batch
+    starts is dropped and its row never written.
+
+    When the queue is full submit() returns None and the caller should
+    write synchronously instead.
+    """
+
+    def __init__(
+        self,
+        flush_batch: Callable[[list[dict]], list],
+        max_queue: int = WRITE_BEHIND_MAX_QUEUE,
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        flush_ms: float = WRITE_BEHIND_FLUSH_MS,
+    ):
+        self._flush_batch = flush_batch
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_ms / 1000
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "queue_full": 0,
+            "cancelled": 0,
+            "batches": 0,
+            "rows_flushed": 0,
+            "failed_batches": 0,
+            "max_queue_depth": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    def submit(self, row: dict) -> Optional[Future]:
+        """Queue a row for the next batch; None if the queue is full."""
+        self._ensure_running()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((row, future))
+        except queue.Full:
+            with self._stats_lock:
+                self._stats["queue_full"] += 1
+            return None
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+        return future
+
+    def stop(self, timeout: float = 10):
+        """Flush what is queued and stop the flusher thread."""
+        self._stopping.set()
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        total_ms = stats.pop("total_flush_ms")
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_flush_ms"] = round(total_ms / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
+
+    def _ensure_running(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="observation-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._flush(batch)
+
+    def _flush(self, batch: list):
+        # Drop rows whose caller gave up waiting; the rest can no longer be cancelled
+        running = [(row, future) for row, future in batch if future.set_running_or_notify_cancel()]
+        if len(running) < len(batch):
+            with self._stats_lock:
+                self._stats["cancelled"] += len(batch) - len(running)
+        batch = running
+        if not batch:
+            return
+        rows = [row for row, _ in batch]
+        start = time.perf_counter()
+        try:
+            results = self._flush_batch(rows)
+        except Exception as e:
+            logger.error(f"Write-behind batch of {len(batch)} failed: {e}")
+            with self._stats_lock:
+                self._stats["failed_batches"] += 1
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["rows_flushed"] += len(batch)
+            self._stats["last_flush_ms"] = round(elapsed_ms, 2)
+            self._stats["max_flush_ms"] = round(max(self._stats["max_flush_ms"], elapsed_ms), 2)
+            self._stats["total_flush_ms"] += elapsed_ms
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+import logging
+
+from app.config import (
+    RATE_LIMIT_HOUR_MAX,
+    RATE_LIMIT_DAY_MAX,
+    RATE_LIMIT_MEMORY_MAX_IPS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def minutes_until_reset(usage: Optional[dict], now: datetime) -> int:
+    """
+    Minutes until an IP may report again, or 0 if it is under both limits.
+
+    `usage` holds hour_count, hour_latest, day_count and day_oldest for
+    the IP's reports in the last 24 hours.
+    """
+    if not usage:
+        return 0
+
+    if usage["hour_count"] >= RATE_LIMIT_HOUR_MAX:
+        # Minutes until the hour window resets
+        if usage["hour_latest"]:
+            reset_time = usage["hour_latest"] + timedelta(hours=1)
+            remaining = (reset_time - now).total_seconds() / 60
+            return max(1, int(remaining))
+        return 60
+
+    if usage["day_count"] >= RATE_LIMIT_DAY_MAX:
+        # Minutes until oldest submission ages out of 24h window
+        if usage["day_oldest"]:
+            reset_time = usage["day_oldest"] + timedelta(hours=24)
+            remaining = (reset_time - now).total_seconds() / 60
+            return max(1, int(remaining))
+        return 60
+
+    return 0
+
+
+class SlidingWindowRateLimiter:
+    """
+    In-process sliding-window rate limiter keyed by hashed IP.
+
+    Keeps each IP's accepted submission times from the last 24 hours in a
+    deque, held in a bounded LRU so memory stays flat however many IPs
+    report. The limiter only knows about submissions this process has
+    seen or been seeded with; the DB check remains authoritative.
+    """
+
+    def __init__(self, max_ips: int = RATE_LIMIT_MEMORY_MAX_IPS):
+        self._max_ips = max_ips
+        self._history: OrderedDict[str, deque] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seed(self, ip_hash: str, timestamps: Iterable[datetime]):
+        """Load an IP's recent submission times, e.g. from the DB."""
+        with self._lock:
+            self._history[ip_hash] = deque(sorted(timestamps), maxlen=RATE_LIMIT_DAY_MAX)
+            self._history.move_to_end(ip_hash)
+            self._evict()
+
+    def record(self, ip_hash: str, timestamp: datetime):
+        """Note an accepted submission."""
+        with self._lock:
+            times = self._history.get(ip_hash)
+            if times is None:
+                times = self._history[ip_hash] = deque(maxlen=RATE_LIMIT_DAY_MAX)
+            times.append(timestamp)
+            self._history.move_to_end(ip_hash)
+            self._evict()
+
+    def forget(self, ip_hash: str):
+        """Drop an IP's history so the next check reseeds it."""
+        with self._lock:
+            self._history.pop(ip_hash, None)
+
+    def check(self, ip_hash: str, now: Optional[datetime] = None) -> Optional[int]:
+        """
+        Minutes until the IP may report again (0 if allowed).
+
+        Returns None if this process has no history for the IP.
+        """
+        now = now or datetime.now(timezone.utc)
+        hour_ago = now - timedelta(hours=1)
+        day_ago = now - timedelta(hours=24)
+
+        with self._lock:
+            times = self._history.get(ip_hash)
+            if times is None:
+                return None
+            self._history.move_to_end(ip_hash)
+
+            while times and times[0] <= day_ago:
+                times.popleft()
+
+            hour_times = [t for t in times if t > hour_ago]
+            usage = {
+                "hour_count": len(hour_times),
+                "hour_latest": hour_times[-1] if hour_times else None,
+                "day_count": len(times),
+                "day_oldest": times[0] if times else None,
+            }
+
+        return minutes_until_reset(usage, now)
+
+    def _evict(self):
+        """Drop least recently seen IPs beyond the size bound. Caller holds the lock."""
+        while len(self._history) > self._max_ips:
+            self._history.popitem(last=False)
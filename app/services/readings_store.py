@@ -0,0 +1,169 @@
+import threading
+from datetime import datetime
+from typing import Optional
+import logging
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+from app.config import READINGS_STORE_ENABLED, READINGS_STORE_RETRY_AFTER
+from app.database import get_db_cursor
+from app.services.timeseries import ReadingSeries
+
+logger = logging.getLogger(__name__)
+
+# Reading kind -> table, both keyed by (station_id, timestamp_utc)
+READING_TABLES = {
+    "river": "river_readings",
+    "rainfall": "rainfall_readings",
+}
+
+
+class ReadingsRecorder:
+    """
+    Copies EA readings from the in-memory buffers into Postgres.
+
+    Fetches mark a station's buffer dirty; a background thread writes the
+    readings newer than the last one it stored for that station, batched
+    into one INSERT ... ON CONFLICT DO NOTHING per table. Working from the
+    buffers rather than a queue of fetches means nothing is lost if the
+    DB is briefly down: the next pass writes everything still missing.
+    """
+
+    def __init__(self, retry_after: float = READINGS_STORE_RETRY_AFTER):
+        self._retry_after = retry_after
+        self._dirty: dict[tuple[str, str], object] = {}  # (kind, station_id) -> buffer
+        self._stored_up_to: dict[tuple[str, str], np.datetime64] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"rows_written": 0, "batches": 0, "errors": 0}
+
+    def mark_dirty(self, kind: str, station_id: str, buffer):
+        """Note that a station's buffer (anything with a .series) has new readings."""
+        with self._lock:
+            self._dirty[(kind, station_id)] = buffer
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="readings-recorder", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def flush(self):
+        """Write every pending reading now."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+
+        rows_by_table: dict[str, list] = {}
+        new_marks = {}
+        for key, buffer in dirty.items():
+            kind, station_id = key
+            series = buffer.series
+            stored = self._stored_up_to.get(key)
+            new = series.after(stored) if stored is not None else series
+            if not len(new):
+                continue
+            rows_by_table.setdefault(READING_TABLES[kind], []).extend(
+                (station_id, int(t), float(v))
+                for t, v in zip(new.times.astype(np.int64), new.values)
+            )
+            new_marks[key] = new.times[-1]
+
+        if not rows_by_table:
+            return
+
+        try:
+            with get_db_cursor() as cur:
+                for table, rows in rows_by_table.items():
+                    execute_values(cur, f"""
+                        INSERT INTO {table} (station_id, timestamp_utc, value)
+                        VALUES %s
+                        ON CONFLICT (station_id, timestamp_utc) DO NOTHING
+                    """, rows, template="(%s, to_timestamp(%s), %s)", page_size=1000)
+        except Exception:
+            # Put the stations back; the next pass retries from the same point
+            with self._lock:
+                for key, buffer in dirty.items():
+                    self._dirty.setdefault(key, buffer)
+                self._stats["errors"] += 1
+            raise
+
+        with self._lock:
+            self._stored_up_to.update(new_marks)
+            self._stats["batches"] += 1
+            self._stats["rows_written"] += sum(len(rows) for rows in rows_by_table.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "pending_stations": len(self._dirty)}
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Storing readings failed, retrying in {self._retry_after}s: {e}")
+                self._wake.wait(self._retry_after)
+                self._wake.set()
+
+
+# Process-wide recorder, fed by every EA readings fetch
+_recorder = ReadingsRecorder()
+
+
+def record_readings(kind: str, station_id: str, buffer):
+    """Queue a station's new readings for storage (no-op without a database)."""
+    if READINGS_STORE_ENABLED:
+        _recorder.mark_dirty(kind, station_id, buffer)
+
+
+def flush_readings():
+    """Write readings still waiting for storage (e.g. on shutdown)."""
+    if READINGS_STORE_ENABLED:
+        try:
+            _recorder.flush()
+        except Exception as e:
+            logger.error(f"Storing readings on shutdown failed: {e}")
+
+
+def get_recorder_stats() -> dict:
+    return _recorder.stats()
+
+
+def load_readings(
+    kind: str,
+    station_id: str,
+    since: datetime,
+    until: Optional[datetime] = None,
+) -> ReadingSeries:
+    """Stored readings for a station at or after `since` (and at or before `until`), oldest first."""
+    with get_db_cursor() as cur:
+        cur.execute(f"""
+            SELECT EXTRACT(EPOCH FROM timestamp_utc)::bigint AS ts, value
+            FROM {READING_TABLES[kind]}
+            WHERE station_id = %s AND timestamp_utc >= %s
+              AND (%s::timestamptz IS NULL OR timestamp_utc <= %s)
+            ORDER BY timestamp_utc
+        """, (station_id, since, until, until))
+        rows = cur.fetchall()
+    return ReadingSeries(
+        np.array([row["ts"] for row in rows], dtype=np.int64).astype("datetime64[s]"),
+        np.array([row["value"] for row in rows], dtype=np.float64),
+    )
+
+
+def store_series(kind: str, station_id: str, series: ReadingSeries):
+    """Upsert a series synchronously (used when a history read falls back to EA)."""
+    if not len(series):
+        return
+    rows = [
+        (station_id, int(t), float(v))
+        for t, v in zip(series.times.astype(np.int64), series.values)
+    ]
+    with get_db_cursor() as cur:
+        execute_values(cur, f"""
+            INSERT INTO {READING_TABLES[kind]} (station_id, timestamp_utc, value)
+            VALUES %s
+            ON CONFLICT (station_id, timestamp_utc) DO NOTHING
+        """, rows, template="(%s, to_timestamp(%s), %s)", page_size=1000)
@@ -0,0 +1,38 @@
+from app.components.road_card import road_card
+from app.models.domain import RoadId
+from app.services.fragment_cache import cached_fragment, invalidate_fragment
+from app.services.road_service import get_road_snapshots, get_road_versions
+
+
+def road_cards(road_ids: list[RoadId]) -> list:
+    """
+    Road cards for the given roads, reusing rendered HTML while each road's
+    reports are unchanged. Versions cost one small query; snapshots are
+    loaded, in one more, only if some card has to be rendered.
+    """
+    snapshots = {}
+
+    def render(road_id: RoadId):
+        if not snapshots:
+            snapshots.update(get_road_snapshots(road_ids, history_limit=5))
+        snapshot = snapshots[road_id]
+        return road_card(
+            road_id,
+            snapshot.consensus,
+            snapshot.status_counts,
+            snapshot.status_change,
+            snapshot.observations,
+        )
+
+    versions = get_road_versions(road_ids)
+    if versions is None:
+        return [render(road_id) for road_id in road_ids]
+    cards = [
+        cached_fragment(f"road:{road_id.value}", versions[road_id], lambda road_id=road_id: render(road_id))
+        for road_id in road_ids
+    ]
+    # A card rendered from a failed load must not be served from the cache
+    for road_id, snapshot in snapshots.items():
+        if snapshot.failed:
+            invalidate_fragment(f"road:{road_id.value}")
+    return cards
@@ -1,15 +1,28 @@
 import hashlib
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 import logging
 from collections import defaultdict
+from dataclasses import replace
 
 from app.database import get_db_cursor
+from app.services.consensus_engine import ConsensusEngine
+from app.services.rate_limiter import SlidingWindowRateLimiter, minutes_until_reset
+from app.services.observation_writer import ObservationWriter
+from app.services.fragment_cache import invalidate_fragment
 from app.config import (
     CONSENSUS_LOOKBACK_HOURS,
     CONFIDENCE_WEIGHTS,
+    DEFAULT_CONFIDENCE_WEIGHT,
+    CONSENSUS_ENGINE_ENABLED,
+    CONSENSUS_DECAY_ENABLED,
+    CONSENSUS_DECAY_HALF_LIFE_HOURS,
     RATE_LIMIT_HOUR_MAX,
     RATE_LIMIT_DAY_MAX,
+    OBSERVATION_WRITE_BEHIND,
+    WRITE_BEHIND_ACK_TIMEOUT,
     IP_SALT,
 )
 from app.models.domain import (
@@ -18,10 +31,17 @@ from app.models.domain import (
     Confidence,
     Observation,
     ConsensusResult,
+    RoadSnapshot,
 )
 
 logger = logging.getLogger(__name__)
 
+# Process-wide consensus engine, used when CONSENSUS_ENGINE_ENABLED
+_consensus_engine = ConsensusEngine()
+
+# Process-wide rate limiter, checked before any DB work on submission
+_rate_limiter = SlidingWindowRateLimiter()
+
 
 def hash_ip(ip_address: str) -> str:
     """Create a salted hash of an IP address for privacy."""
@@ -29,59 +49,46 @@ def hash_ip(ip_address: str) -> str:
     return hashlib.sha256(salted.encode()).hexdigest()
 
 
-def check_rate_limit(ip_hash: str) -> tuple[bool, int]:
+def check_local_rate_limit(ip_hash: str) -> int:
     """
-    Check if IP has exceeded rate limit (1/hour, 4/day).
+    Minutes until the IP may report again per the in-process limiter (0 if allowed).
 
-    Returns: (is_limited, minutes_until_reset)
+    Answers from memory when this process has seen the IP before, so spam
+    bursts are rejected without touching Postgres. Otherwise (e.g. after a
+    cold start) the IP's last 24 hours are loaded from the DB once.
+    submit_observation still makes the authoritative check.
     """
+    remaining = _rate_limiter.check(ip_hash)
+    if remaining is not None:
+        return remaining
+
     try:
         with get_db_cursor() as cur:
-            now = datetime.now(timezone.utc)
-            hour_ago = now - timedelta(hours=1)
-            day_ago = now - timedelta(hours=24)
-
-            # Check hourly limit
-            cur.execute("""
-                SELECT COUNT(*) as count, MAX(timestamp_utc) as latest
-                FROM observations
-                WHERE ip_hash = %s AND timestamp_utc > %s
-            """, (ip_hash, hour_ago))
-            hour_row = cur.fetchone()
-            hour_count = hour_row["count"] if hour_row else 0
-
-            if hour_count >= RATE_LIMIT_HOUR_MAX:
-                # Minutes until the hour window resets
-                if hour_row and hour_row["latest"]:
-                    reset_time = hour_row["latest"] + timedelta(hours=1)
-                    remaining = (reset_time - now).total_seconds() / 60
-                    return True, max(1, int(remaining))
-                return True, 60
-
-            # Check daily limit
             cur.execute("""
-                SELECT COUNT(*) as count, MIN(timestamp_utc) as oldest
+                SELECT timestamp_utc
                 FROM observations
                 WHERE ip_hash = %s AND timestamp_utc > %s
-            """, (ip_hash, day_ago))
-            day_row = cur.fetchone()
-            day_count = day_row["count"] if day_row else 0
-
-            if day_count >= RATE_LIMIT_DAY_MAX:
-                # Minutes until oldest submission ages out of 24h window
-                if day_row and day_row["oldest"]:
-                    reset_time = day_row["oldest"] + timedelta(hours=24)
-                    remaining = (reset_time - now).total_seconds() / 60
-                    return True, max(1, int(remaining))
-                return True, 60
-
-            return False, 0
+            """, (ip_hash, datetime.now(timezone.utc) - timedelta(hours=24)))
+
+            _rate_limiter.seed(ip_hash, [row["timestamp_utc"] for row in cur.fetchall()])
     except Exception as e:
-        logger.error(f"Rate limit check failed: {e}")
-        return False, 0
+        logger.error(f"Rate limit history load failed: {e}")
+        return 0
+
+    return _rate_limiter.check(ip_hash) or 0
+
+
+def _rate_limit_params(ip_hash: str, now: datetime) -> dict:
+    return {
+        "ip_hash": ip_hash,
+        "hour_ago": now - timedelta(hours=1),
+        "day_ago": now - timedelta(hours=24),
+        "hour_max": RATE_LIMIT_HOUR_MAX,
+        "day_max": RATE_LIMIT_DAY_MAX,
+    }
 
 
-def add_observation(
+def submit_observation(
     road_id: RoadId,
     status: RoadStatus,
     confidence: Confidence,
@@ -91,86 +98,412 @@ def add_observation(
     rainfall_24h_mm: Optional[float] = None,
     rainfall_48h_mm: Optional[float] = None,
     rainfall_72h_mm: Optional[float] = None,
-) -> Optional[str]:
+) -> tuple[Optional[str], int]:
     """
-    Add a new road status observation with environmental context.
-
-    Returns the observation ID if successful, None on failure.
+    Rate-limit check and insert in a single round trip.
+
+    The hourly and daily windows are counted and the row inserted only if
+    both are under their limits, all in one statement. A transaction-level
+    advisory lock on the IP hash stops two concurrent submissions from the
+    same IP both passing the check.
+
+    With OBSERVATION_WRITE_BEHIND the report joins the next batch of the
+    write-behind queue instead, and this waits for that batch to commit.
+    If the queue is full it is written directly as above. If the batch has
+    not started within WRITE_BEHIND_ACK_TIMEOUT the report is withdrawn
+    from the queue and the submit fails; once started, its outcome is
+    awaited, so a failed submit is never written behind the user's back.
+
+    Returns: (observation_id, minutes_until_reset). observation_id is None
+    when rate limited (minutes > 0) or when the insert failed (minutes 0).
     """
+    now = datetime.now(timezone.utc)
+    if OBSERVATION_WRITE_BEHIND:
+        future = _observation_writer.submit({
+            "id": str(uuid.uuid4()),
+            "road_id": road_id.value,
+            "status": status.value,
+            "confidence": confidence.value,
+            "comment": comment,
+            "ip_hash": ip_hash,
+            "river_level_m": river_level_m,
+            "rainfall_24h_mm": rainfall_24h_mm,
+            "rainfall_48h_mm": rainfall_48h_mm,
+            "rainfall_72h_mm": rainfall_72h_mm,
+        })
+        if future is not None:
+            try:
+                row = future.result(timeout=WRITE_BEHIND_ACK_TIMEOUT)
+            except FutureTimeoutError:
+                if future.cancel():
+                    # Still queued and now never written, so the user can safely resubmit
+                    logger.error("Write-behind ack timed out, report withdrawn from the queue")
+                    return None, 0
+                # Its batch is already being written; report what that batch decides
+                try:
+                    row = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to submit observation: {e}")
+                    return None, 0
+            except Exception as e:
+                logger.error(f"Failed to submit observation: {e}")
+                return None, 0
+            return _submission_outcome(row, road_id, status, confidence, ip_hash, now)
+        logger.warning("Write-behind queue full, inserting synchronously")
+
     try:
         with get_db_cursor() as cur:
+
+            # Sent as one batch; the lock is held until the transaction commits
             cur.execute("""
-                INSERT INTO observations (
-                    road_id, status, confidence, comment, ip_hash,
-                    river_level_m, rainfall_24h_mm, rainfall_48h_mm, rainfall_72h_mm
+                SELECT pg_advisory_xact_lock(hashtext(%(ip_hash)s));
+
+                WITH usage AS (
+                    SELECT COUNT(*) FILTER (WHERE timestamp_utc > %(hour_ago)s) AS hour_count,
+                           MAX(timestamp_utc) FILTER (WHERE timestamp_utc > %(hour_ago)s) AS hour_latest,
+                           COUNT(*) AS day_count,
+                           MIN(timestamp_utc) AS day_oldest
+                    FROM observations
+                    WHERE ip_hash = %(ip_hash)s AND timestamp_utc > %(day_ago)s
+                ),
+                inserted AS (
+                    INSERT INTO observations (
+                        road_id, status, confidence, comment, ip_hash,
+                        river_level_m, rainfall_24h_mm, rainfall_48h_mm, rainfall_72h_mm
+                    )
+                    SELECT %(road_id)s, %(status)s, %(confidence)s, %(comment)s, %(ip_hash)s,
+                           %(river_level_m)s, %(rainfall_24h_mm)s, %(rainfall_48h_mm)s,
+                           %(rainfall_72h_mm)s
+                    FROM usage
+                    WHERE usage.hour_count < %(hour_max)s
+                      AND usage.day_count < %(day_max)s
+                    RETURNING id, timestamp_utc
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (
-                road_id.value, status.value, confidence.value, comment, ip_hash,
-                river_level_m, rainfall_24h_mm, rainfall_48h_mm, rainfall_72h_mm
-            ))
+                SELECT usage.*, inserted.id, inserted.timestamp_utc
+                FROM usage
+                LEFT JOIN inserted ON TRUE
+            """, {
+                **_rate_limit_params(ip_hash, now),
+                "road_id": road_id.value,
+                "status": status.value,
+                "confidence": confidence.value,
+                "comment": comment,
+                "river_level_m": river_level_m,
+                "rainfall_24h_mm": rainfall_24h_mm,
+                "rainfall_48h_mm": rainfall_48h_mm,
+                "rainfall_72h_mm": rainfall_72h_mm,
+            })
 
             row = cur.fetchone()
-            return str(row["id"]) if row else None
+        return _submission_outcome(row, road_id, status, confidence, ip_hash, now)
     except Exception as e:
-        logger.error(f"Failed to add observation: {e}")
-        return None
+        logger.error(f"Failed to submit observation: {e}")
+        return None, 0
 
 
-def get_consensus(road_id: RoadId) -> Optional[ConsensusResult]:
+def _submission_outcome(
+    row: Optional[dict],
+    road_id: RoadId,
+    status: RoadStatus,
+    confidence: Confidence,
+    ip_hash: str,
+    now: datetime,
+) -> tuple[Optional[str], int]:
+    """Turn a usage + insert row into submit_observation's result."""
+    if not row:
+        return None, 0
+    if row["id"] is None:
+        # Another instance saw reports this process didn't; reseed next time
+        _rate_limiter.forget(ip_hash)
+        return None, minutes_until_reset(row, now)
+
+    _rate_limiter.record(ip_hash, row["timestamp_utc"])
+    _consensus_engine.add_observation(road_id, status, confidence.value, row["timestamp_utc"])
+    invalidate_fragment(f"road:{road_id.value}")
+    return str(row["id"]), 0
+
+
+def _flush_observation_batch(rows: list[dict]) -> list[Optional[dict]]:
     """
-    Calculate consensus status for a road based on recent reports.
-
-    Uses weighted voting by confidence level.
+    Rate-limit check and insert a batch of queued reports in one transaction.
+
+    Applies submit_observation's rule as if the rows had arrived one after
+    another: each row also counts the rows from the same IP accepted
+    earlier in the batch (a rejected row does not use up quota). Advisory
+    locks on every IP in the batch are taken in a fixed order so
+    concurrent batches cannot deadlock. Returns, for each row, its usage
+    counts with id and timestamp_utc (id None if rate limited).
     """
-    try:
-        with get_db_cursor() as cur:
-            lookback = datetime.now(timezone.utc) - timedelta(hours=CONSENSUS_LOOKBACK_HOURS)
+    now = datetime.now(timezone.utc)
+    with get_db_cursor() as cur:
+
+        # Sent as one batch; the locks are held until the transaction commits
+        cur.execute("""
+            SELECT pg_advisory_xact_lock(lock_key)
+            FROM (
+                SELECT DISTINCT hashtext(ip) AS lock_key
+                FROM unnest(%(ip_hashes)s::varchar[]) AS ip
+                ORDER BY lock_key
+            ) AS locks;
+
+            SELECT ip_hash,
+                   COUNT(*) FILTER (WHERE timestamp_utc > %(hour_ago)s) AS hour_count,
+                   MAX(timestamp_utc) FILTER (WHERE timestamp_utc > %(hour_ago)s) AS hour_latest,
+                   COUNT(*) AS day_count,
+                   MIN(timestamp_utc) AS day_oldest
+            FROM observations
+            WHERE ip_hash = ANY(%(ip_hashes)s::varchar[]) AND timestamp_utc > %(day_ago)s
+            GROUP BY ip_hash
+        """, {
+            "ip_hashes": [row["ip_hash"] for row in rows],
+            "hour_ago": now - timedelta(hours=1),
+            "day_ago": now - timedelta(hours=24),
+        })
+        usage_by_ip = {usage.pop("ip_hash"): dict(usage) for usage in cur.fetchall()}
+
+        # Walk the batch in arrival order, counting only the rows accepted
+        results, accepted = [], []
+        for row in rows:
+            usage = usage_by_ip.setdefault(
+                row["ip_hash"],
+                {"hour_count": 0, "hour_latest": None, "day_count": 0, "day_oldest": None},
+            )
+            results.append({**usage, "id": None, "timestamp_utc": None})
+            if usage["hour_count"] < RATE_LIMIT_HOUR_MAX and usage["day_count"] < RATE_LIMIT_DAY_MAX:
+                accepted.append(row)
+                usage["hour_count"] += 1
+                usage["hour_latest"] = now
+                usage["day_count"] += 1
+                usage["day_oldest"] = usage["day_oldest"] or now
+
+        if accepted:
+            def column(name):
+                return [row[name] for row in accepted]
 
             cur.execute("""
-                SELECT status, confidence, timestamp_utc
-                FROM observations
-                WHERE road_id = %s
-                  AND timestamp_utc > %s
-                ORDER BY timestamp_utc DESC
-            """, (road_id.value, lookback))
+                INSERT INTO observations (
+                    id, road_id, status, confidence, comment, ip_hash,
+                    river_level_m, rainfall_24h_mm, rainfall_48h_mm, rainfall_72h_mm
+                )
+                SELECT * FROM unnest(
+                    %(ids)s::uuid[], %(road_ids)s::varchar[], %(statuses)s::int[],
+                    %(confidences)s::varchar[], %(comments)s::text[], %(ip_hashes)s::varchar[],
+                    %(river_levels)s::numeric[], %(rain_24h)s::numeric[],
+                    %(rain_48h)s::numeric[], %(rain_72h)s::numeric[]
+                )
+                RETURNING id, timestamp_utc
+            """, {
+                "ids": column("id"),
+                "road_ids": column("road_id"),
+                "statuses": column("status"),
+                "confidences": column("confidence"),
+                "comments": column("comment"),
+                "ip_hashes": column("ip_hash"),
+                "river_levels": column("river_level_m"),
+                "rain_24h": column("rainfall_24h_mm"),
+                "rain_48h": column("rainfall_48h_mm"),
+                "rain_72h": column("rainfall_72h_mm"),
+            })
+            inserted = {str(row["id"]): row["timestamp_utc"] for row in cur.fetchall()}
+            for row, result in zip(rows, results):
+                if row["id"] in inserted:
+                    result["id"], result["timestamp_utc"] = row["id"], inserted[row["id"]]
 
-            rows = cur.fetchall()
-            if not rows:
-                return None
+    return results
+
+
+# Process-wide write-behind queue, used when OBSERVATION_WRITE_BEHIND
+_observation_writer = ObservationWriter(_flush_observation_batch)
 
-            # Calculate weighted votes for each status
-            status_weights = defaultdict(float)
-            for row in rows:
-                status = row["status"]
-                confidence = row["confidence"]
-                weight = CONFIDENCE_WEIGHTS.get(confidence, 0.5)
-                status_weights[status] += weight
 
-            # Find status with highest weight
-            consensus_status = max(status_weights.keys(), key=lambda s: status_weights[s])
-            last_report_time = rows[0]["timestamp_utc"]
+def get_write_behind_stats() -> Optional[dict]:
+    """Queue depth and flush latency of the write-behind queue, if enabled."""
+    return _observation_writer.stats() if OBSERVATION_WRITE_BEHIND else None
+
+
+def stop_observation_writer():
+    """Flush queued reports and stop the write-behind thread (on app shutdown)."""
+    _observation_writer.stop()
+
+
+def get_consensus(
+    road_id: RoadId,
+    use_engine: bool = CONSENSUS_ENGINE_ENABLED,
+) -> Optional[ConsensusResult]:
+    """
+    Calculate consensus status for a road based on recent reports.
+
+    Uses weighted voting by confidence level, aggregated in Postgres so
+    only the winning status comes back however many reports there are.
+    With use_engine, reads come from the in-memory ConsensusEngine instead.
+    """
+    if use_engine:
+        return _engine_consensus(road_id)
+
+    try:
+        with get_db_cursor() as cur:
+            now = datetime.now(timezone.utc)
+            lookback = now - timedelta(hours=CONSENSUS_LOOKBACK_HOURS)
+            row = _query_consensus(cur, road_id.value, lookback, now)
+            if not row:
+                return None
 
             return ConsensusResult(
                 road_id=road_id,
-                status=RoadStatus(consensus_status),
-                report_count=len(rows),
-                last_report_time=last_report_time,
+                status=RoadStatus(row["status"]),
+                report_count=int(row["report_count"]),
+                last_report_time=row["last_report_time"],
             )
     except Exception as e:
         logger.error(f"Failed to get consensus: {e}")
         return None
 
 
-def get_all_consensus() -> dict[RoadId, Optional[ConsensusResult]]:
-    """Get consensus status for all roads."""
+# Half-life used by consensus queries, or None for flat weighting
+DECAY_HALF_LIFE_HOURS = CONSENSUS_DECAY_HALF_LIFE_HOURS if CONSENSUS_DECAY_ENABLED else None
+
+# Per-report vote weight, computed for every row in the same pass as the
+# aggregate. Confidence weights come from the `weights` CTE, built from a
+# parameterised table: unnest(confidences, weights) AS w(confidence, weight).
+# Unknown confidence values fall back to DEFAULT_CONFIDENCE_WEIGHT. With a
+# half-life set, each weight is scaled by 0.5 ^ (age / half-life).
+_WEIGHT_SQL = """
+    COALESCE(w.weight, %(default_weight)s) * CASE
+        WHEN %(half_life_seconds)s::float8 IS NULL THEN 1.0
+        ELSE power(
+            0.5::float8,
+            EXTRACT(EPOCH FROM (%(now)s - o.timestamp_utc))::float8
+                / %(half_life_seconds)s::float8
+        )
+    END
+"""
+
+
+def _weight_params(now: datetime, half_life_hours: Optional[float]) -> dict:
+    """Query parameters used by the `weights` CTE and _WEIGHT_SQL."""
     return {
-        RoadId.ICKFORD_ENTRANCE: get_consensus(RoadId.ICKFORD_ENTRANCE),
-        RoadId.FISHERMAN_THAME_ENTRANCE: get_consensus(RoadId.FISHERMAN_THAME_ENTRANCE),
+        "weight_confidences": list(CONFIDENCE_WEIGHTS.keys()),
+        "weight_values": list(CONFIDENCE_WEIGHTS.values()),
+        "default_weight": DEFAULT_CONFIDENCE_WEIGHT,
+        "half_life_seconds": half_life_hours * 3600 if half_life_hours else None,
+        "now": now,
     }
 
 
+def _query_consensus(
+    cur,
+    road_id: str,
+    since: datetime,
+    now: Optional[datetime] = None,
+    half_life_hours: Optional[float] = DECAY_HALF_LIFE_HOURS,
+) -> Optional[dict]:
+    """
+    Run the weighted vote for one road on an open cursor.
+
+    Returns the winning row (status, report_count, last_report_time) or
+    None if there are no reports since `since`. Weight sums are rounded so
+    ties are exact; they go to the most recently reported status.
+    """
+    now = now or datetime.now(timezone.utc)
+    cur.execute(f"""
+        WITH weights AS (
+            SELECT *
+            FROM unnest(
+                %(weight_confidences)s::varchar[],
+                %(weight_values)s::float8[]
+            ) AS w(confidence, weight)
+        ),
+        votes AS (
+            SELECT o.status,
+                   ROUND(SUM({_WEIGHT_SQL})::numeric, 6) AS weight,
+                   COUNT(*) AS report_count,
+                   MAX(o.timestamp_utc) AS last_report_time
+            FROM observations o
+            LEFT JOIN weights w ON w.confidence = o.confidence
+            WHERE o.road_id = %(road_id)s
+              AND o.timestamp_utc > %(since)s
+            GROUP BY o.status
+        )
+        SELECT status,
+               SUM(report_count) OVER () AS report_count,
+               MAX(last_report_time) OVER () AS last_report_time
+        FROM votes
+        ORDER BY votes.weight DESC, votes.last_report_time DESC
+        LIMIT 1
+    """, {**_weight_params(now, half_life_hours), "road_id": road_id, "since": since})
+
+    return cur.fetchone()
+
+
+def _engine_consensus(road_id: RoadId) -> Optional[ConsensusResult]:
+    """
+    Consensus from the in-memory engine.
+
+    Loads the engine from the DB on first use and reconciles it against
+    the SQL vote every CONSENSUS_RECONCILE_INTERVAL seconds, reloading if
+    it has drifted. Falls back to SQL if the engine cannot be loaded.
+    """
+    try:
+        if not _consensus_engine.loaded:
+            _load_consensus_engine()
+        elif _consensus_engine.reconcile_due():
+            for road in RoadId:
+                if not _consensus_engine.matches(road, get_consensus(road, use_engine=False)):
+                    logger.warning(f"Consensus engine drifted for {road.value}, reloading")
+                    _load_consensus_engine()
+                    break
+    except Exception as e:
+        logger.error(f"Failed to refresh consensus engine: {e}")
+
+    if not _consensus_engine.loaded:
+        return get_consensus(road_id, use_engine=False)
+    return _consensus_engine.get(road_id)
+
+
+def _load_consensus_engine():
+    """Rebuild the consensus engine from every report in the lookback window."""
+    with get_db_cursor() as cur:
+        lookback = datetime.now(timezone.utc) - timedelta(hours=CONSENSUS_LOOKBACK_HOURS)
+
+        cur.execute("""
+            SELECT road_id, status, confidence, timestamp_utc
+            FROM observations
+            WHERE timestamp_utc > %s
+        """, (lookback,))
+
+        _consensus_engine.load(cur.fetchall())
+
+
+def _consensus_from_rows(road_id: RoadId, rows: list[dict]) -> Optional[ConsensusResult]:
+    """
+    Reference weighted vote over raw rows (newest first) in Python.
+
+    This was get_consensus before aggregation moved into SQL; it is kept
+    so scripts/check_consensus.py can verify the two agree.
+    """
+    if not rows:
+        return None
+
+    # Calculate weighted votes for each status
+    status_weights = defaultdict(float)
+    for row in rows:
+        status = row["status"]
+        confidence = row["confidence"]
+        weight = CONFIDENCE_WEIGHTS.get(confidence, DEFAULT_CONFIDENCE_WEIGHT)
+        status_weights[status] += weight
+
+    # Find status with highest weight
+    consensus_status = max(status_weights.keys(), key=lambda s: status_weights[s])
+    last_report_time = rows[0]["timestamp_utc"]
+
+    return ConsensusResult(
+        road_id=road_id,
+        status=RoadStatus(consensus_status),
+        report_count=len(rows),
+        last_report_time=last_report_time,
+    )
+
+
 def get_recent_observations(road_id: RoadId, limit: int = 10) -> list[Observation]:
     """Get recent observations for a road."""
     try:
@@ -201,62 +534,193 @@ def get_recent_observations(road_id: RoadId, limit: int = 10) -> list[Observatio
         return []
 
 
-def get_24h_status_counts(road_id: RoadId) -> dict[RoadStatus, int]:
+def get_road_versions(road_ids: Optional[list[RoadId]] = None) -> Optional[dict[RoadId, tuple]]:
     """
-    Get count of reports by status in the last 24 hours.
+    Data version of each road's reports: (24h report count, latest timestamp).
 
-    Returns dict mapping status to count of reports.
+    Any new report changes it, on this instance or another, so it keys
+    the rendered road cards. One query that reads only the last 24 hours
+    of each road off the (road_id, timestamp_utc) index; None if the
+    database is unavailable.
     """
+    road_ids = list(road_ids) if road_ids is not None else list(RoadId)
     try:
         with get_db_cursor() as cur:
-            lookback = datetime.now(timezone.utc) - timedelta(hours=24)
-
             cur.execute("""
-                SELECT status, COUNT(*) as count
-                FROM observations
-                WHERE road_id = %s
-                  AND timestamp_utc > %s
-                GROUP BY status
-                ORDER BY count DESC
-            """, (road_id.value, lookback))
-
-            rows = cur.fetchall()
-            return {RoadStatus(row["status"]): row["count"] for row in rows}
+                SELECT r.road_id, v.report_count, v.latest
+                FROM unnest(%s::varchar[]) AS r(road_id)
+                CROSS JOIN LATERAL (
+                    SELECT COUNT(*) AS report_count, MAX(o.timestamp_utc) AS latest
+                    FROM observations o
+                    WHERE o.road_id = r.road_id AND o.timestamp_utc > %s
+                ) AS v
+            """, ([road_id.value for road_id in road_ids], datetime.now(timezone.utc) - timedelta(hours=24)))
+            rows = {row["road_id"]: (row["report_count"], row["latest"]) for row in cur.fetchall()}
     except Exception as e:
-        logger.error(f"Failed to get 24h status counts: {e}")
-        return {}
+        logger.error(f"Failed to get road versions: {e}")
+        return None
+    return {road_id: rows.get(road_id.value, (0, None)) for road_id in road_ids}
 
 
-def get_status_change_info(road_id: RoadId) -> Optional[tuple[RoadStatus, datetime]]:
+def get_road_snapshots(
+    road_ids: Optional[list[RoadId]] = None,
+    history_limit: int = 5,
+) -> dict[RoadId, RoadSnapshot]:
     """
-    Detect if the most recent report changed the consensus status.
+    Load consensus, 24h counts, status change and recent history for roads.
 
-    Returns (previous_status, change_time) if status changed recently,
-    or None if no recent change detected.
+    Costs one round trip however many roads are requested: a LATERAL join
+    pulls the latest reports per road off the (road_id, timestamp_utc)
+    index, and one grouped tally covers both the consensus and 24h windows.
+    Consensus matches get_consensus and the history matches
+    get_recent_observations.
     """
+    road_ids = list(road_ids) if road_ids is not None else list(RoadId)
+    snapshots = {
+        road_id: RoadSnapshot(
+            road_id=road_id,
+            consensus=None,
+            status_counts={},
+            status_change=None,
+            observations=[],
+        )
+        for road_id in road_ids
+    }
+    if not road_ids:
+        return snapshots
+
     try:
         with get_db_cursor() as cur:
-            # Get two most recent reports
-            cur.execute("""
-                SELECT status, timestamp_utc
-                FROM observations
-                WHERE road_id = %s
-                ORDER BY timestamp_utc DESC
-                LIMIT 2
-            """, (road_id.value,))
+            now = datetime.now(timezone.utc)
+
+            cur.execute(f"""
+                WITH roads AS (
+                    SELECT unnest(%(road_ids)s::varchar[]) AS road_id
+                ),
+                weights AS (
+                    SELECT *
+                    FROM unnest(
+                        %(weight_confidences)s::varchar[],
+                        %(weight_values)s::float8[]
+                    ) AS w(confidence, weight)
+                ),
+                latest AS (
+                    SELECT r.road_id, o.id, o.timestamp_utc, o.status,
+                           o.confidence, o.comment, o.ip_hash
+                    FROM roads r
+                    CROSS JOIN LATERAL (
+                        SELECT id, timestamp_utc, status, confidence, comment, ip_hash
+                        FROM observations
+                        WHERE road_id = r.road_id
+                        ORDER BY timestamp_utc DESC
+                        LIMIT %(latest_limit)s
+                    ) o
+                ),
+                tallies AS (
+                    SELECT o.road_id, o.status,
+                           COUNT(*) FILTER (
+                               WHERE o.timestamp_utc > %(day_since)s
+                           ) AS day_count,
+                           COUNT(*) FILTER (
+                               WHERE o.timestamp_utc > %(consensus_since)s
+                           ) AS consensus_count,
+                           ROUND(SUM({_WEIGHT_SQL}) FILTER (
+                               WHERE o.timestamp_utc > %(consensus_since)s
+                           )::numeric, 6) AS consensus_weight,
+                           MAX(o.timestamp_utc) FILTER (
+                               WHERE o.timestamp_utc > %(consensus_since)s
+                           ) AS consensus_latest
+                    FROM observations o
+                    LEFT JOIN weights w ON w.confidence = o.confidence
+                    WHERE o.road_id = ANY(%(road_ids)s::varchar[])
+                      AND o.timestamp_utc > LEAST(%(day_since)s, %(consensus_since)s)
+                    GROUP BY o.road_id, o.status
+                )
+                SELECT 'latest' AS kind, road_id, id, timestamp_utc, status,
+                       confidence, comment, ip_hash,
+                       NULL::bigint AS day_count, NULL::bigint AS consensus_count,
+                       NULL::numeric AS consensus_weight
+                FROM latest
+                UNION ALL
+                SELECT 'tally', road_id, NULL, consensus_latest, status,
+                       NULL, NULL, NULL, day_count, consensus_count, consensus_weight
+                FROM tallies
+                ORDER BY kind, road_id, timestamp_utc DESC NULLS LAST
+            """, {
+                **_weight_params(now, DECAY_HALF_LIFE_HOURS),
+                "road_ids": [road_id.value for road_id in road_ids],
+                "latest_limit": max(history_limit, 2),
+                "day_since": now - timedelta(hours=24),
+                "consensus_since": now - timedelta(hours=CONSENSUS_LOOKBACK_HOURS),
+            })
 
             rows = cur.fetchall()
-            if len(rows) < 2:
-                return None
+    except Exception as e:
+        logger.error(f"Failed to get road snapshots: {e}")
+        return {road_id: replace(snapshot, failed=True) for road_id, snapshot in snapshots.items()}
+
+    latest_rows = defaultdict(list)
+    tally_rows = defaultdict(list)
+    for row in rows:
+        road_id = RoadId(row["road_id"])
+        if row["kind"] == "latest":
+            latest_rows[road_id].append(row)
+        else:
+            tally_rows[road_id].append(row)
+
+    for road_id, snapshot in snapshots.items():
+        latest = latest_rows[road_id]
+        tallies = tally_rows[road_id]
+
+        if CONSENSUS_ENGINE_ENABLED:
+            snapshot.consensus = _engine_consensus(road_id)
+        else:
+            snapshot.consensus = _consensus_from_tallies(road_id, tallies)
+
+        snapshot.status_counts = {
+            RoadStatus(row["status"]): row["day_count"]
+            for row in tallies
+            if row["day_count"]
+        }
+
+        # Status change: did the latest report differ from the one before?
+        if len(latest) >= 2 and latest[0]["status"] != latest[1]["status"]:
+            snapshot.status_change = (
+                RoadStatus(latest[1]["status"]),
+                latest[0]["timestamp_utc"],
+            )
 
-            current_status = RoadStatus(rows[0]["status"])
-            previous_status = RoadStatus(rows[1]["status"])
+        snapshot.observations = [
+            Observation(
+                id=str(row["id"]),
+                timestamp_utc=row["timestamp_utc"],
+                road_id=road_id,
+                status=RoadStatus(row["status"]),
+                confidence=Confidence(row["confidence"]),
+                comment=row["comment"],
+                ip_hash=row["ip_hash"],
+            )
+            for row in latest[:history_limit]
+        ]
 
-            if current_status != previous_status:
-                # Status changed with the latest report
-                return (previous_status, rows[0]["timestamp_utc"])
+    return snapshots
 
-            return None
-    except Exception as e:
-        logger.error(f"Failed to get status change info: {e}")
+
+def _consensus_from_tallies(road_id: RoadId, tallies: list[dict]) -> Optional[ConsensusResult]:
+    """
+    Pick the consensus from per-status weighted tallies.
+
+    Ties go to the status reported most recently, as in get_consensus.
+    """
+    votes = [row for row in tallies if row["consensus_count"]]
+    if not votes:
         return None
+
+    winner = max(votes, key=lambda row: (row["consensus_weight"], row["timestamp_utc"]))
+
+    return ConsensusResult(
+        road_id=road_id,
+        status=RoadStatus(winner["status"]),
+        report_count=sum(row["consensus_count"] for row in votes),
+        last_report_time=max(row["timestamp_utc"] for row in votes),
+    )
@@ -0,0 +1,107 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from app.config import STATION_INDEX_CELL_DEG
+from app.models.domain import Station
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distances (km) from one point to arrays of points."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class StationIndex:
+    """
+    Grid over station coordinates for nearest-N lookups.
+
+    Stations are bucketed into cell_deg x cell_deg cells. A query scans
+    rings of cells outward from its own cell and stops once the rings
+    scanned are guaranteed to contain the N nearest stations (or every
+    station within max_km), so only nearby stations are ever measured.
+    """
+
+    def __init__(self, stations: list[Station], cell_deg: float = STATION_INDEX_CELL_DEG):
+        self.stations = stations
+        self._cell_deg = cell_deg
+        self._lats = np.array([s.lat for s in stations], dtype=np.float64)
+        self._lons = np.array([s.lon for s in stations], dtype=np.float64)
+
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, station in enumerate(stations):
+            cells.setdefault(self._cell(station.lat, station.lon), []).append(i)
+        self._cells = {cell: np.array(members) for cell, members in cells.items()}
+        rows = [i for i, _ in cells]
+        cols = [j for _, j in cells]
+        self._bounds = (min(rows), max(rows), min(cols), max(cols)) if cells else None
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def nearest(self, lat: float, lon: float, n: int, max_km: Optional[float] = None) -> list[Station]:
+        """Up to n stations nearest to (lat, lon), closest first, optionally within max_km."""
+        if not self.stations or n <= 0:
+            return []
+
+        ci, cj = self._cell(lat, lon)
+        # Ring that reaches the furthest occupied cell
+        min_i, max_i, min_j, max_j = self._bounds
+        last_ring = max(abs(ci - min_i), abs(ci - max_i), abs(cj - min_j), abs(cj - max_j))
+        candidates = []
+        ring = 0
+        while True:
+            candidates.extend(
+                self._cells[cell] for cell in self._ring(ci, cj, ring) if cell in self._cells
+            )
+            # Any station not yet scanned is at least this far away
+            covered_km = self._covered_km(lat, ring)
+
+            if ring >= last_ring or (max_km is not None and covered_km >= max_km):
+                break
+            if sum(len(c) for c in candidates) >= n:
+                idx = np.concatenate(candidates)
+                dists = haversine_km(lat, lon, self._lats[idx], self._lons[idx])
+                if np.partition(dists, n - 1)[n - 1] <= covered_km:
+                    break
+            ring += 1
+
+        if not candidates:
+            return []
+        idx = np.concatenate(candidates)
+        dists = haversine_km(lat, lon, self._lats[idx], self._lons[idx])
+        order = np.argsort(dists, kind="stable")
+        if max_km is not None:
+            order = order[dists[order] <= max_km]
+        return [self.stations[i] for i in idx[order[:n]]]
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self._cell_deg), math.floor(lon / self._cell_deg)
+
+    def _covered_km(self, lat: float, ring: int) -> float:
+        """Lower bound on the distance to any cell outside the first ring + 1 rings."""
+        # Longitude cells narrow towards the poles; use the narrowest latitude reached
+        poleward_lat = min(90.0, abs(lat) + (ring + 1) * self._cell_deg)
+        lon_km = KM_PER_DEG * math.cos(math.radians(poleward_lat))
+        return ring * self._cell_deg * min(KM_PER_DEG, lon_km)
+
+    @staticmethod
+    def _ring(ci: int, cj: int, ring: int):
+        if ring == 0:
+            yield ci, cj
+            return
+        for dj in range(-ring, ring + 1):
+            yield ci - ring, cj + dj
+            yield ci + ring, cj + dj
+        for di in range(-ring + 1, ring):
+            yield ci + di, cj - ring
+            yield ci + di, cj + ring
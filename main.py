@@ -1,4 +1,5 @@
 from fasthtml.common import *
+import hmac
 import logging
 
 # Configure logging
@@ -8,10 +9,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+async def lifespan(app):
+    """Run the live conditions poller; release shared connections on shutdown."""
+    from app.services.live_conditions import start_poller, stop_poller
+    start_poller()
+    yield
+    await stop_poller()
+    from app.services.ea_api import flush_cache, close_client, close_async_client
+    from app.services.road_service import stop_observation_writer
+    from app.database import close_pool
+    from app.services.readings_store import flush_readings
+    stop_observation_writer()
+    flush_readings()
+    flush_cache()
+    close_client()
+    await close_async_client()
+    close_pool()
+
+
 # Create FastHTML app
 app, rt = fast_app(
     live=True,  # Enable live reload in development
     pico=False,  # We load Pico CSS manually in layout
+    lifespan=lifespan,
 )
 
 # Register routes
@@ -31,11 +52,16 @@ def get(fname: str):
 # Health check endpoint
 @rt('/health')
 def get():
-    from app.database import check_db_connection
+    from app.database import check_db_connection, get_pool_stats
+    from app.services.road_service import get_write_behind_stats
+    from app.services.fragment_cache import get_fragment_stats
     db_ok = check_db_connection()
     return {
         "status": "healthy" if db_ok else "degraded",
-        "database": "connected" if db_ok else "disconnected"
+        "database": "connected" if db_ok else "disconnected",
+        "db_pool": get_pool_stats(),
+        "write_behind": get_write_behind_stats(),
+        "fragments": get_fragment_stats(),
     }
 
 
@@ -59,6 +85,23 @@ def get():
     return {"status": "already_initialized"}
 
 
+@rt('/api/enrich')
+def get(request):
+    """Backfill river and rainfall onto pending reports (for a cron job on serverless)."""
+    from app.config import CRON_SECRET
+    supplied = request.headers.get("authorization", "").encode()
+    if not CRON_SECRET or not hmac.compare_digest(supplied, f"Bearer {CRON_SECRET}".encode()):
+        return Response("Unauthorized", status_code=401)
+    try:
+        from app.services.ea_api import get_live_conditions
+        from app.services.enrichment import enrich_observations
+        get_live_conditions()  # bring this instance's reading buffers up to date
+        return {"status": "ok", "enriched": enrich_observations()}
+    except Exception as e:
+        logger.error(f"Enrichment failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+
 # Debug endpoint - remove in production
 @rt('/api/debug/observations')
 def get():
@@ -73,6 +116,14 @@ def get():
         return {"error": str(e)}
 
 
+# Debug endpoint - remove in production
+@rt('/api/debug/ea')
+def get():
+    """Debug: EA client connection reuse and cache counters."""
+    from app.services.ea_api import get_client_stats
+    return get_client_stats()
+
+
 # Run server
 if __name__ == "__main__":
     serve()
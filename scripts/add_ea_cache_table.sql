@@ -0,0 +1,13 @@
+-- Migration: Add the shared EA API cache table
+-- Lets serverless instances share EA responses and reading history
+
+-- UNLOGGED: no WAL writes, contents may be lost on a crash (fine for a cache)
+CREATE UNLOGGED TABLE IF NOT EXISTS ea_cache (
+    key VARCHAR(200) PRIMARY KEY,
+    payload JSONB NOT NULL,
+    stored_at TIMESTAMPTZ NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+COMMENT ON TABLE ea_cache IS 'Second-level cache of Environment Agency API data, shared by app instances';
+COMMENT ON COLUMN ea_cache.expires_at IS 'After this the entry is only used as a stale fallback';
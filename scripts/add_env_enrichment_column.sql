@@ -0,0 +1,18 @@
+-- Migration: Track deferred environmental enrichment of observations
+-- Reports are saved immediately; river and rainfall at the report time are filled in later
+
+ALTER TABLE observations
+ADD COLUMN IF NOT EXISTS env_enriched_at TIMESTAMPTZ;
+
+-- Reports saved with conditions by the old submit path need no enrichment
+UPDATE observations
+SET env_enriched_at = timestamp_utc
+WHERE env_enriched_at IS NULL
+  AND (river_level_m IS NOT NULL OR rainfall_24h_mm IS NOT NULL);
+
+-- Index for the enrichment job's pending queue
+CREATE INDEX IF NOT EXISTS idx_observations_unenriched
+ON observations (timestamp_utc)
+WHERE env_enriched_at IS NULL;
+
+COMMENT ON COLUMN observations.env_enriched_at IS 'When river and rainfall columns were filled in; NULL while pending';
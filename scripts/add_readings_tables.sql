@@ -0,0 +1,19 @@
+-- Migration: Store EA river and rainfall readings locally
+-- Keeps reading history beyond the EA API's lookback for charts and model training
+
+CREATE TABLE IF NOT EXISTS river_readings (
+    station_id VARCHAR(50) NOT NULL,
+    timestamp_utc TIMESTAMPTZ NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (station_id, timestamp_utc)
+);
+
+CREATE TABLE IF NOT EXISTS rainfall_readings (
+    station_id VARCHAR(50) NOT NULL,
+    timestamp_utc TIMESTAMPTZ NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (station_id, timestamp_utc)
+);
+
+COMMENT ON COLUMN river_readings.value IS 'River level (metres) from the EA gauge';
+COMMENT ON COLUMN rainfall_readings.value IS 'Rainfall (mm) in the 15 minutes up to timestamp_utc';
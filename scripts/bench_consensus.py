@@ -0,0 +1,135 @@
+"""
+Benchmark consensus computation at flood-night report volumes.
+
+Inserts synthetic reports (10k by default) into a temporary observations
+table, indexed like the real one and shadowing it for this session, then
+times:
+
+- python loop: fetch every row in the window and vote in Python (the
+  original get_consensus)
+- sql flat:    the grouped SQL vote without decay
+- sql decayed: the grouped SQL vote with the exponential time decay
+
+The real table is never written, locked or analysed, so this can be run
+against any database.
+
+Usage:
+    python scripts/bench_consensus.py [--reports 10000] [--repeat 20]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from psycopg2.extras import execute_values  # noqa: E402
+
+from app.config import CONSENSUS_LOOKBACK_HOURS, CONSENSUS_DECAY_HALF_LIFE_HOURS  # noqa: E402
+from app.database import get_db_connection  # noqa: E402
+from app.models.domain import RoadId, RoadStatus, Confidence  # noqa: E402
+from app.services.road_service import _consensus_from_rows, _query_consensus  # noqa: E402
+
+BENCH_ROAD_ID = "CONSENSUS_BENCH"
+BENCH_IP_HASH = "consensus-bench"
+
+
+def _create_scratch_table(cur):
+    """Temporary observations table with the real one's consensus index."""
+    cur.execute("""
+        CREATE TEMP TABLE observations (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            timestamp_utc TIMESTAMPTZ NOT NULL,
+            road_id VARCHAR(50) NOT NULL,
+            status INTEGER NOT NULL,
+            confidence VARCHAR(20) NOT NULL,
+            ip_hash VARCHAR(64) NOT NULL
+        ) ON COMMIT DROP;
+
+        CREATE INDEX ON observations (road_id, timestamp_utc DESC);
+    """)
+
+
+def _seed(cur, reports: int):
+    now = datetime.now(timezone.utc)
+    window = CONSENSUS_LOOKBACK_HOURS * 3600
+    statuses = [s.value for s in RoadStatus]
+    confidences = [c.value for c in Confidence]
+    rows = [
+        (
+            now - timedelta(seconds=random.uniform(0, window)),
+            BENCH_ROAD_ID,
+            random.choice(statuses),
+            random.choice(confidences),
+            BENCH_IP_HASH,
+        )
+        for _ in range(reports)
+    ]
+    execute_values(cur, """
+        INSERT INTO observations (timestamp_utc, road_id, status, confidence, ip_hash)
+        VALUES %s
+    """, rows, page_size=1000)
+    cur.execute("ANALYZE pg_temp.observations")
+
+
+def _python_loop(cur, since: datetime):
+    cur.execute("""
+        SELECT status, confidence, timestamp_utc
+        FROM observations
+        WHERE road_id = %s
+          AND timestamp_utc > %s
+        ORDER BY timestamp_utc DESC
+    """, (BENCH_ROAD_ID, since))
+    return _consensus_from_rows(RoadId.ICKFORD_ENTRANCE, cur.fetchall())
+
+
+def _time(fn, repeat: int) -> list[float]:
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reports", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with get_db_connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                _create_scratch_table(cur)
+                _seed(cur, args.reports)
+                since = datetime.now(timezone.utc) - timedelta(hours=CONSENSUS_LOOKBACK_HOURS)
+
+                cases = {
+                    "python loop": lambda: _python_loop(cur, since),
+                    "sql flat": lambda: _query_consensus(
+                        cur, BENCH_ROAD_ID, since, half_life_hours=None
+                    ),
+                    "sql decayed": lambda: _query_consensus(
+                        cur, BENCH_ROAD_ID, since, half_life_hours=CONSENSUS_DECAY_HALF_LIFE_HOURS
+                    ),
+                }
+
+                print(f"{args.reports} reports, {args.repeat} runs each")
+                for name, fn in cases.items():
+                    timings = _time(fn, args.repeat)
+                    print(
+                        f"{name:>12}: median {statistics.median(timings):7.2f} ms"
+                        f"  min {min(timings):7.2f} ms"
+                    )
+        finally:
+            # Drops the temporary table
+            conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Check the SQL consensus aggregation against the reference Python vote.
+
+Compares _query_consensus (the Postgres query behind get_consensus) with
+_consensus_from_rows, the original row-by-row Python weighting, on a
+seeded synthetic dataset: fixed cases followed by randomised trials.
+The same --seed always produces the same reports. Decayed votes (the
+CONSENSUS_DECAY half-life) are checked against the same weighting with
+each report's weight halved every half-life.
+
+The SQL vote deliberately differs from the reference in one way: weight
+sums are rounded to 6 places, so sums that differ only by float noise
+(e.g. 10 x 0.3 vs 3 x 1.0) tie, and ties go to the status reported most
+recently. Such cases are listed as rounding ties, not mismatches; any
+other disagreement fails the check.
+
+Reports are written to a temporary observations table that shadows the
+real one inside a transaction that is rolled back, so the check needs no
+production data and never touches it: any Postgres will do, e.g. a
+scratch database. --live also compares the two on the real reports for
+every road first.
+
+Usage:
+    python scripts/check_consensus.py [--seed 0] [--trials 200] [--live]
+"""
+import argparse
+import random
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import (  # noqa: E402
+    CONSENSUS_LOOKBACK_HOURS,
+    CONFIDENCE_WEIGHTS,
+    DEFAULT_CONFIDENCE_WEIGHT,
+)
+from app.database import get_db_connection  # noqa: E402
+from app.models.domain import RoadId, RoadStatus, Confidence  # noqa: E402
+from app.services.road_service import _consensus_from_rows, _query_consensus  # noqa: E402
+
+CHECK_ROAD_ID = "CONSENSUS_CHECK"
+CHECK_IP_HASH = "consensus-check"
+HALF_LIFE_HOURS = 2.0  # half-life used for the decayed checks
+
+DROVE, SAW, HEARD = Confidence.DROVE_IT.value, Confidence.SAW_IT.value, Confidence.HEARD_IT.value
+UNKNOWN = "UNLISTED"  # not in CONFIDENCE_WEIGHTS, so DEFAULT_CONFIDENCE_WEIGHT applies
+
+# name -> (reports as (minutes ago, status, confidence), half-life in hours or None, expected status)
+FIXED_CASES = {
+    "exact tie goes to the newer status": (
+        [(30, 1, DROVE), (10, 5, DROVE)], None, 5,
+    ),
+    "exact tie goes to the newer status, reversed": (
+        [(10, 1, DROVE), (30, 5, DROVE)], None, 1,
+    ),
+    "tie only after rounding (10 x 0.3 vs 3 x 1.0), newer wins": (
+        [(100 + i, 2, HEARD) for i in range(10)] + [(20, 4, DROVE), (15, 4, DROVE), (5, 4, DROVE)], None, 4,
+    ),
+    "tie only after rounding, other status newer": (
+        [(100 + i, 4, DROVE) for i in range(3)] + [(60 - i, 2, HEARD) for i in range(10)], None, 2,
+    ),
+    "equal sums in a different order (0.8 + 0.3 vs 0.3 + 0.8)": (
+        [(50, 3, SAW), (40, 3, HEARD), (30, 1, HEARD), (20, 1, SAW)], None, 1,
+    ),
+    "unlisted confidence uses the default weight": (
+        [(40, 2, UNKNOWN), (30, 2, UNKNOWN), (50, 5, DROVE)], None, 2,
+    ),
+    "higher weight beats more reports": (
+        [(10, 1, HEARD), (11, 1, HEARD), (12, 1, HEARD), (40, 5, DROVE), (41, 5, SAW)], None, 5,
+    ),
+    "reports before the lookback do not vote": (
+        [(CONSENSUS_LOOKBACK_HOURS * 60 + 5 + i, 5, DROVE) for i in range(5)] + [(90, 3, HEARD)], None, 3,
+    ),
+    "undecayed, old strong reports win": (
+        [(360, 5, DROVE), (365, 5, DROVE), (5, 1, HEARD)], None, 5,
+    ),
+    "decayed, a fresh weak report beats the same old strong ones": (
+        [(360, 5, DROVE), (365, 5, DROVE), (5, 1, HEARD)], HALF_LIFE_HOURS, 1,
+    ),
+    "decayed, a fresh strong report stays ahead of older ones": (
+        [(5, 2, DROVE), (30, 4, SAW), (35, 4, HEARD)], HALF_LIFE_HOURS, 2,
+    ),
+    "decayed, reports before the lookback still do not vote": (
+        [(CONSENSUS_LOOKBACK_HOURS * 60 + 5 + i, 5, DROVE) for i in range(20)] + [(470, 3, HEARD)],
+        HALF_LIFE_HOURS, 3,
+    ),
+}
+
+
+def _create_scratch_table(cur):
+    """Temporary observations table; it shadows the real one for this session."""
+    cur.execute("""
+        CREATE TEMP TABLE observations (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            timestamp_utc TIMESTAMPTZ NOT NULL,
+            road_id VARCHAR(50) NOT NULL,
+            status INTEGER NOT NULL,
+            confidence VARCHAR(20) NOT NULL,
+            ip_hash VARCHAR(64) NOT NULL
+        ) ON COMMIT DROP
+    """)
+
+
+def _insert_reports(cur, now: datetime, reports: list[tuple[float, int, str]]):
+    cur.execute("DELETE FROM observations WHERE road_id = %s", (CHECK_ROAD_ID,))
+    for minutes_ago, status, confidence in reports:
+        cur.execute("""
+            INSERT INTO observations (timestamp_utc, road_id, status, confidence, ip_hash)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (now - timedelta(minutes=minutes_ago), CHECK_ROAD_ID, status, confidence, CHECK_IP_HASH))
+
+
+def _fetch_rows(cur, road_id: str, since: datetime) -> list[dict]:
+    cur.execute("""
+        SELECT status, confidence, timestamp_utc
+        FROM observations
+        WHERE road_id = %s
+          AND timestamp_utc > %s
+        ORDER BY timestamp_utc DESC
+    """, (road_id, since))
+    return cur.fetchall()
+
+
+def _weights(rows: list[dict], now: datetime, half_life_hours: Optional[float]) -> tuple[dict, dict]:
+    """Unrounded weight sum and latest report time per status."""
+    weights, latest = defaultdict(float), {}
+    for row in rows:
+        weight = CONFIDENCE_WEIGHTS.get(row["confidence"], DEFAULT_CONFIDENCE_WEIGHT)
+        if half_life_hours:
+            age_hours = (now - row["timestamp_utc"]).total_seconds() / 3600
+            weight *= 0.5 ** (age_hours / half_life_hours)
+        weights[row["status"]] += weight
+        latest.setdefault(row["status"], row["timestamp_utc"])
+    return weights, latest
+
+
+def _reference_status(rows: list[dict], now: datetime, half_life_hours: Optional[float]) -> Optional[int]:
+    """The reference vote: _consensus_from_rows, or the same weighting decayed."""
+    if not half_life_hours:
+        result = _consensus_from_rows(RoadId.ICKFORD_ENTRANCE, rows)
+        return result.status.value if result else None
+    if not rows:
+        return None
+    weights, _ = _weights(rows, now, half_life_hours)
+    # Rows are newest first, so max() keeps the most recent of exact ties, as the original does
+    return max(weights.keys(), key=lambda s: weights[s])
+
+
+def _compare(
+    cur,
+    road_id: str,
+    now: datetime,
+    since: datetime,
+    half_life_hours: Optional[float] = None,
+    expected_status: Optional[int] = None,
+) -> tuple[Optional[str], Optional[str]]:
+    """(disagreement or None, note on a rounding tie the rule settled or None)."""
+    rows = _fetch_rows(cur, road_id, since)
+    reference = _reference_status(rows, now, half_life_hours)
+    actual = _query_consensus(cur, road_id, since, now=now, half_life_hours=half_life_hours)
+
+    if reference is None or actual is None:
+        if reference is None and actual is None:
+            return None, None
+        return f"python={reference} sql={actual}", None
+
+    if int(actual["report_count"]) != len(rows):
+        return f"report_count python={len(rows)} sql={actual['report_count']}", None
+    if actual["last_report_time"] != rows[0]["timestamp_utc"]:
+        return f"last_report_time python={rows[0]['timestamp_utc']} sql={actual['last_report_time']}", None
+    if expected_status is not None and actual["status"] != expected_status:
+        return f"status {RoadStatus(actual['status']).name}, expected {RoadStatus(expected_status).name}", None
+
+    note = None
+    if actual["status"] != reference:
+        # Allowed only where the SQL rule applies: equal after rounding, newer status wins
+        weights, latest = _weights(rows, now, half_life_hours)
+        rounded_tie = round(weights[actual["status"]], 6) == round(weights[reference], 6)
+        if not (rounded_tie and latest[actual["status"]] > latest[reference]):
+            return f"status python={RoadStatus(reference).name} sql={RoadStatus(actual['status']).name}", None
+        note = f"rounding tie: python={RoadStatus(reference).name} sql={RoadStatus(actual['status']).name}"
+    return None, note
+
+
+def check_live(cur, now: datetime, since: datetime) -> int:
+    failures = 0
+    for road_id in RoadId:
+        problem, note = _compare(cur, road_id.value, now, since)
+        print(f"{road_id.value}: {'MISMATCH ' + problem if problem else 'ok'}{f' ({note})' if note else ''}")
+        failures += bool(problem)
+    return failures
+
+
+def check_fixed(cur, now: datetime, since: datetime) -> int:
+    failures = 0
+    for name, (reports, half_life_hours, expected_status) in FIXED_CASES.items():
+        _insert_reports(cur, now, reports)
+        problem, note = _compare(cur, CHECK_ROAD_ID, now, since, half_life_hours, expected_status)
+        print(f"{name}: {'MISMATCH ' + problem if problem else 'ok'}{f' ({note})' if note else ''}")
+        failures += bool(problem)
+    return failures
+
+
+def check_synthetic(cur, now: datetime, since: datetime, trials: int, seed: int) -> int:
+    rng = random.Random(seed)
+    statuses = [s.value for s in RoadStatus]
+    confidences = [c.value for c in Confidence] + [UNKNOWN]
+    window_minutes = CONSENSUS_LOOKBACK_HOURS * 60
+    failures = 0
+    rounding_ties = 0
+
+    for trial in range(trials):
+        # Whole, distinct minutes: equal timestamps would make the tie-break arbitrary
+        minutes = rng.sample(range(int(window_minutes * 1.2)), rng.randint(0, 60))
+        _insert_reports(cur, now, [
+            (minutes_ago, rng.choice(statuses), rng.choice(confidences))
+            for minutes_ago in minutes
+        ])
+
+        for half_life_hours in (None, HALF_LIFE_HOURS):
+            problem, note = _compare(cur, CHECK_ROAD_ID, now, since, half_life_hours)
+            label = "decayed" if half_life_hours else "undecayed"
+            if problem:
+                print(f"trial {trial} ({label}): MISMATCH {problem}")
+                failures += 1
+            rounding_ties += bool(note)
+
+    checks = trials * 2
+    print(
+        f"synthetic (seed {seed}): {checks - failures}/{checks} votes agree "
+        f"({rounding_ties} settled by the rounding rule)"
+    )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="seed for the randomised trials")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--live", action="store_true", help="also compare on the real reports")
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    since = now - timedelta(hours=CONSENSUS_LOOKBACK_HOURS)
+
+    with get_db_connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                failures = check_live(cur, now, since) if args.live else 0
+                _create_scratch_table(cur)
+                failures += check_fixed(cur, now, since)
+                failures += check_synthetic(cur, now, since, args.trials, args.seed)
+        finally:
+            # Nothing written here is ever committed
+            conn.rollback()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Local stand-in for the EA flood-monitoring API, replaying recorded responses.
+
+Record once against the live API (the server proxies every request and
+saves the response), then replay offline with injected latency, errors
+and timeouts to measure cache hit ratios, timeout handling and page
+latency reproducibly.
+
+Fixtures are keyed by path and query minus `since`. On replay every
+reading is shifted forward by whole 15-minute steps so the newest one
+is current, and `since` filters the shifted readings, so buffers, trends
+and staleness behave as they would against the live API. Responses carry
+an ETag, so conditional requests get 304s.
+
+Usage:
+    # Record: run the app through the proxy until it has made every request
+    python scripts/ea_replay.py --record
+    EA_BASE_URL=http://127.0.0.1:8765 python main.py
+
+    # Replay with faults; /api/debug/ea on the app shows cache and client stats
+    python scripts/ea_replay.py --latency-ms 150 --jitter-ms 100 --error-rate 0.02 --timeout-rate 0.01
+    EA_BASE_URL=http://127.0.0.1:8765 python main.py
+
+GET /_replay/stats on the replay server returns its request counters.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+import httpx
+
+LIVE_EA_URL = "https://environment.data.gov.uk/flood-monitoring"
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "ea"
+
+# EA readings are every 15 minutes; shifting by whole steps keeps them aligned
+READING_STEP = timedelta(minutes=15)
+EA_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Query parameters that only narrow a readings window; fixtures ignore them
+WINDOW_PARAMS = {"since"}
+
+
+def fixture_key(path: str, query: str) -> str:
+    params = sorted(
+        (k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in WINDOW_PARAMS
+    )
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.strptime(value[:19], EA_TIME_FORMAT[:-1]).replace(tzinfo=timezone.utc)
+
+
+class FixtureStore:
+    """Recorded responses, one JSON file per fixture key."""
+
+    def __init__(self, directory: Path):
+        self._dir = directory
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{quote(key, safe='')}.json"
+
+    def load(self, key: str):
+        path = self._path(key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def save(self, key: str, body: dict):
+        """Keep the recording with the most items, e.g. a full window over a top-up."""
+        with self._lock:
+            existing = self.load(key)
+            if existing and len(existing["body"].get("items", [])) > len(body.get("items", [])):
+                return
+            self._dir.mkdir(parents=True, exist_ok=True)
+            self._path(key).write_text(json.dumps({
+                "key": key,
+                "recorded_at": datetime.now(timezone.utc).strftime(EA_TIME_FORMAT),
+                "body": body,
+            }))
+
+
+def replay_body(fixture: dict, query: str, now: datetime) -> dict:
+    """Recorded body with readings shifted to the present and cut to `since`."""
+    body = fixture["body"]
+    items = body.get("items")
+    if not isinstance(items, list):
+        return body
+
+    steps = (now - _parse_time(fixture["recorded_at"])) // READING_STEP
+    shift = steps * READING_STEP
+    since = dict(parse_qsl(query)).get("since")
+    since_time = datetime.fromisoformat(since.replace("Z", "+00:00")) if since else None
+
+    shifted = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("dateTime"), str):
+            shifted.append(item)
+            continue
+        when = _parse_time(item["dateTime"]) + shift
+        if since_time is not None and when < since_time:
+            continue
+        shifted.append({**item, "dateTime": when.strftime(EA_TIME_FORMAT)})
+    return {**body, "items": shifted}
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, args):
+        super().__init__(address, ReplayHandler)
+        self.args = args
+        self.fixtures = FixtureStore(Path(args.fixtures))
+        self.upstream = httpx.Client(timeout=30) if args.record else None
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "replayed": 0,
+            "not_modified": 0,
+            "recorded": 0,
+            "missing": 0,
+            "injected_errors": 0,
+            "injected_timeouts": 0,
+        }
+
+    def count(self, counter: str):
+        with self.stats_lock:
+            self.stats[counter] += 1
+
+    def roll(self) -> tuple[float, float]:
+        """(uniform draw for faults, added jitter in seconds), from the seeded RNG."""
+        with self.rng_lock:
+            return self.rng.random(), self.rng.uniform(0, self.args.jitter_ms) / 1000
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/_replay/stats":
+            with self.server.stats_lock:
+                self._send_json(200, dict(self.server.stats))
+            return
+
+        args = self.server.args
+        self.server.count("requests")
+        draw, jitter = self.server.roll()
+        time.sleep(args.latency_ms / 1000 + jitter)
+
+        if draw < args.timeout_rate:
+            # Hold the connection past the client's timeout, then drop it
+            self.server.count("injected_timeouts")
+            time.sleep(args.timeout_s)
+            self.close_connection = True
+            return
+        if draw < args.timeout_rate + args.error_rate:
+            self.server.count("injected_errors")
+            self._send_json(503, {"error": "injected failure"})
+            return
+
+        key = fixture_key(url.path, url.query)
+        if args.record:
+            self._record(key, url)
+            return
+
+        fixture = self.server.fixtures.load(key)
+        if fixture is None:
+            self.server.count("missing")
+            self._send_json(404, {"error": f"no fixture for {key}"})
+            return
+        self.server.count("replayed")
+        self._send_json(200, replay_body(fixture, url.query, datetime.now(timezone.utc)))
+
+    def _record(self, key: str, url):
+        response = self.server.upstream.get(
+            f"{LIVE_EA_URL}{url.path}",
+            params=parse_qsl(url.query, keep_blank_values=True),
+        )
+        if response.status_code != 200:
+            self._send_raw(response.status_code, response.content)
+            return
+        body = response.json()
+        self.server.fixtures.save(key, body)
+        self.server.count("recorded")
+        self._send_json(200, body)
+
+    def _send_json(self, status: int, body: dict):
+        self._send_raw(status, json.dumps(body).encode())
+
+    def _send_raw(self, status: int, data: bytes):
+        etag = f'"{hashlib.sha1(data).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.server.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.args.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES))
+    parser.add_argument("--record", action="store_true", help="proxy to the live API and save responses")
+    parser.add_argument("--latency-ms", type=float, default=0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="uniform extra latency, 0 to this")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests answered 503")
+    parser.add_argument("--timeout-rate", type=float, default=0, help="fraction of requests never answered")
+    parser.add_argument("--timeout-s", type=float, default=30, help="how long a timed-out request is held")
+    parser.add_argument("--seed", type=int, default=None, help="fix the fault sequence")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = ReplayServer((args.host, args.port), args)
+    mode = "recording from the live API" if args.record else f"replaying {args.fixtures}"
+    print(f"EA replay server on http://{args.host}:{args.port} ({mode})")
+    print(f"Run the app with EA_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
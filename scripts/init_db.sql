@@ -20,6 +20,29 @@ ON observations (road_id, timestamp_utc DESC);
 CREATE INDEX IF NOT EXISTS idx_observations_ip_time
 ON observations (ip_hash, timestamp_utc DESC);
 
+-- Stored EA readings (see scripts/add_readings_tables.sql)
+CREATE TABLE IF NOT EXISTS river_readings (
+    station_id VARCHAR(50) NOT NULL,
+    timestamp_utc TIMESTAMPTZ NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (station_id, timestamp_utc)
+);
+
+CREATE TABLE IF NOT EXISTS rainfall_readings (
+    station_id VARCHAR(50) NOT NULL,
+    timestamp_utc TIMESTAMPTZ NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (station_id, timestamp_utc)
+);
+
+-- Shared EA API cache (see scripts/add_ea_cache_table.sql)
+CREATE UNLOGGED TABLE IF NOT EXISTS ea_cache (
+    key VARCHAR(200) PRIMARY KEY,
+    payload JSONB NOT NULL,
+    stored_at TIMESTAMPTZ NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
 -- Road status values:
 -- 1 = CLEAR (passable in any car)
 -- 2 = CAUTION (small cars risky)